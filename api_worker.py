@@ -0,0 +1,127 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import aiohttp
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+import main
+from core.snapshot import SnapshotReplica
+
+# 분리 모드(API_MODE=split)의 API 워커
+#   uvicorn api_worker:app --workers 4
+# - list_projects는 게이트웨이가 복제해주는 스냅샷으로 바로 응답
+# - 문서는 워커가 직접 처리하고, 나머지 요청은 유닉스 소켓으로 게이트웨이에 전달
+# - MCP(/mcp)는 세션을 프로세스 메모리에 두므로 워커끼리 나누지 않고 게이트웨이 한 곳에서 처리 (응답은 SSE 그대로 스트리밍)
+GATEWAY_SOCKET = os.getenv("GATEWAY_SOCKET", main.GATEWAY_SOCKET)
+GATEWAY_URL = "http://gateway"
+LOCAL_PREFIXES = ("/docs", "/redoc", "/openapi.json")
+# 전달하지 않는 hop-by-hop 헤더
+HOP_HEADERS = {"host", "connection", "keep-alive", "transfer-encoding", "content-length", "upgrade"}
+
+app = main.app
+replica = SnapshotReplica()
+session: Optional[aiohttp.ClientSession] = None
+replicator: Optional[asyncio.Task] = None
+
+
+async def replicate_snapshot():
+    while True:
+        params = {"since": replica.version, "wait": 25}
+        if replica.epoch:
+            params["epoch"] = replica.epoch
+        try:
+            async with session.get(f"{GATEWAY_URL}/internal/snapshot", params=params, timeout=aiohttp.ClientTimeout(total=60)) as response:
+                response.raise_for_status()
+                replica.apply(await response.json())
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[api_worker] 스냅샷 동기화 실패: {e}")
+            await asyncio.sleep(1)
+
+
+async def start_worker():
+    global session, replicator
+    session = aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=GATEWAY_SOCKET))
+    replicator = asyncio.create_task(replicate_snapshot())
+
+
+async def stop_worker():
+    if replicator is not None:
+        replicator.cancel()
+        await asyncio.gather(replicator, return_exceptions=True)
+    if session is not None:
+        await session.close()
+
+
+app_lifespan = app.router.lifespan_context
+
+
+@asynccontextmanager
+async def lifespan(app):
+    async with app_lifespan(app):
+        await start_worker()
+        try:
+            yield
+        finally:
+            await stop_worker()
+
+
+app.router.lifespan_context = lifespan
+
+
+def list_projects_from_snapshot(request: Request) -> Response:
+    # main.list_projects와 같은 규칙으로 응답
+    status = "active" if request.query_params.get("status", "active") == "active" else "completed"
+    try:
+        guild_id = int(request.query_params.get("guild_id") or main.GUILD_ID)
+    except ValueError:
+        return JSONResponse({"detail": "guild_id must be an integer."}, status_code=422)
+    projects = replica.projects(guild_id, status)
+    if projects is None:
+        return JSONResponse({"detail": "Bot is not in the specified guild."}, status_code=500)
+    return JSONResponse([{"id": channel_id, "name": name} for channel_id, name in projects])
+
+
+async def forward(request: Request) -> Response:
+    headers = {key: value for key, value in request.headers.items() if key.lower() not in HOP_HEADERS}
+    # chunked 본문(/reply/stream)은 받는 대로 흘려보내고, 나머지는 한 번에 전달
+    if request.headers.get("transfer-encoding", "").lower() == "chunked":
+        body = request.stream()
+    else:
+        body = await request.body()
+    try:
+        response = await session.request(
+            request.method,
+            f"{GATEWAY_URL}{request.url.path}",
+            params=list(request.query_params.multi_items()),
+            data=body,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=None),
+        )
+    except aiohttp.ClientConnectionError as e:
+        return JSONResponse({"detail": f"Gateway is unavailable: {e}"}, status_code=503)
+
+    # 응답도 받는 대로 흘려보냄 (MCP의 SSE 스트림)
+    async def relay():
+        try:
+            async for chunk in response.content.iter_any():
+                yield chunk
+        finally:
+            response.release()
+
+    response_headers = {key: value for key, value in response.headers.items() if key.lower() not in HOP_HEADERS}
+    return StreamingResponse(relay(), status_code=response.status, headers=response_headers)
+
+
+@app.middleware("http")
+async def route_to_gateway(request: Request, call_next):
+    path = request.url.path
+    if path == "/list_projects" and replica.epoch is not None:
+        return list_projects_from_snapshot(request)
+    if path.startswith(LOCAL_PREFIXES):
+        return await call_next(request)
+    return await forward(request)
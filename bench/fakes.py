@@ -0,0 +1,249 @@
+import asyncio
+import itertools
+import random
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+import discord
+
+from core.project_registry import ACTIVE_CATEGORY, COMPLETED_CATEGORY
+
+_ids = itertools.count(1_000_000_000_000_000)
+
+
+def snowflake() -> int:
+    return next(_ids)
+
+
+# --- 디스코드 객체 대역 ---
+# 코그와 색인이 isinstance로 채널 종류를 확인하므로 실제 discord.py 클래스를 상속하고,
+# 게이트웨이 상태 없이 필요한 슬롯만 채움
+class FakeUser:
+    def __init__(self, name: str, bot: bool = False):
+        self.id = snowflake()
+        self.name = name
+        self.display_name = name
+        self.bot = bot
+        self.mention = f"<@{self.id}>"
+
+    def mentioned_in(self, message) -> bool:
+        return message.mention_everyone or any(user.id == self.id for user in message.mentions)
+
+
+class FakeCategory(discord.CategoryChannel):
+    def __init__(self, guild: "FakeGuild", name: str):
+        self.id = snowflake()
+        self.name = name
+        self.guild = guild
+        self.position = len(guild.categories)
+        self.category_id = None
+        self.nsfw = False
+
+
+class FakeForum(discord.ForumChannel):
+    def __init__(self, guild: "FakeGuild", name: str, category: Optional[FakeCategory], tags: list[str] = ()):
+        self.id = snowflake()
+        self.name = name
+        self.guild = guild
+        self.topic = None
+        self.category_id = category.id if category else None
+        self.position = len(guild.channels)
+        self.last_message_id = None
+        self.nsfw = False
+        self._archived_threads: list[FakeThread] = []
+        self._available_tags = {}
+        for tag_name in tags:
+            tag = discord.ForumTag(name=tag_name)
+            tag.id = snowflake()
+            self._available_tags[tag.id] = tag
+
+    @property
+    def threads(self) -> list["FakeThread"]:
+        return [thread for thread in self.guild.threads if thread.parent_id == self.id]
+
+    async def archived_threads(self, limit: Optional[int] = None, **kwargs):
+        # 보관된 스레드 목록 REST 호출을 흉내 냄 (페이지당 100개)
+        for i in range(0, len(self._archived_threads), 100):
+            await asyncio.sleep(self.guild.rest_latency)
+            for thread in self._archived_threads[i:i + 100]:
+                yield thread
+
+    async def edit(self, **fields):
+        # 실제 API 왕복 지연을 흉내 내고, 게이트웨이의 CHANNEL_UPDATE 이벤트를 대신 전달
+        await asyncio.sleep(self.guild.rest_latency)
+        if "category" in fields:
+            self.category_id = fields["category"].id if fields["category"] else None
+        if "available_tags" in fields:
+            self._available_tags = {}
+            for tag in fields["available_tags"]:
+                if not tag.id:
+                    tag.id = snowflake()
+                self._available_tags[tag.id] = tag
+        self.guild.emit_channel_update(self, self)
+        return self
+
+
+class FakeMessage:
+    def __init__(self, channel, author: FakeUser, content: str, mentions: list[FakeUser] = ()):
+        self.id = snowflake()
+        self.channel = channel
+        self.guild = channel.guild
+        self.author = author
+        self.content = content
+        self.mentions = list(mentions)
+        self.mention_everyone = False
+        self.attachments: list = []
+        self.created_at = discord.utils.snowflake_time(self.id)
+        self.edited_at = None
+        self.reactions: list[str] = []
+
+    async def add_reaction(self, emoji: str):
+        await asyncio.sleep(self.channel.guild.rest_latency)
+        self.reactions.append(emoji)
+
+
+class FakeTextChannel:
+    def __init__(self, guild: "FakeGuild", name: str):
+        self.id = snowflake()
+        self.name = name
+        self.guild = guild
+        self.messages: list[FakeMessage] = []
+        self.history_calls = 0
+
+    async def history(self, limit: int = 100):
+        # REST history 호출을 흉내 냄 (최신 메시지부터)
+        self.history_calls += 1
+        await asyncio.sleep(self.guild.rest_latency)
+        for message in reversed(self.messages[-limit:]):
+            yield message
+
+
+class FakeThread(discord.Thread):
+    def __init__(self, forum: FakeForum, name: str, archived: bool = False, tags: list[discord.ForumTag] = ()):
+        self.id = snowflake()
+        self.name = name
+        self.guild = forum.guild
+        self.parent_id = forum.id
+        self.owner_id = None
+        self.archived = archived
+        self.locked = False
+        self.messages: list[FakeMessage] = []
+        self._tags = list(tags)
+        self.history_calls = 0
+
+    @property
+    def applied_tags(self) -> list[discord.ForumTag]:
+        return self._tags
+
+    @property
+    def last_message_id(self) -> Optional[int]:
+        return self.messages[-1].id if self.messages else None
+
+    async def history(self, limit: Optional[int] = 100, after=None, oldest_first: Optional[bool] = None):
+        # REST history 호출을 흉내 냄 (페이지당 100개, 기본은 최신 메시지부터)
+        messages = [message for message in self.messages if after is None or message.id > after.id]
+        if oldest_first is None:
+            oldest_first = after is not None
+        if not oldest_first:
+            messages.reverse()
+        if limit is not None:
+            messages = messages[:limit]
+        for i in range(0, max(len(messages), 1), 100):
+            self.history_calls += 1
+            await asyncio.sleep(self.guild.rest_latency)
+            for message in messages[i:i + 100]:
+                yield message
+
+
+class FakeGuild:
+    def __init__(self, rest_latency: float = 0.05):
+        self.id = snowflake()
+        self.rest_latency = rest_latency
+        self.categories: list[FakeCategory] = []
+        self.channels: list = []
+        self.text_channels: list[FakeTextChannel] = []
+        self.threads: list = []
+        self._by_id: dict[int, object] = {}
+        self.listeners: list[Callable] = []
+
+    @property
+    def forums(self) -> list[FakeForum]:
+        return [channel for channel in self.channels if isinstance(channel, FakeForum)]
+
+    def get_channel(self, channel_id: Optional[int]):
+        return self._by_id.get(channel_id)
+
+    def _add(self, channel):
+        self._by_id[channel.id] = channel
+        self.channels.append(channel)
+
+    def add_category(self, name: str) -> FakeCategory:
+        category = FakeCategory(self, name)
+        self.categories.append(category)
+        self._add(category)
+        return category
+
+    def add_forum(self, name: str, category: Optional[FakeCategory], tags: list[str] = ()) -> FakeForum:
+        forum = FakeForum(self, name, category, tags)
+        self._add(forum)
+        return forum
+
+    def add_thread(self, forum: FakeForum, name: str, archived: bool = False, tags: list[discord.ForumTag] = ()) -> FakeThread:
+        # 활성 스레드만 게이트웨이 캐시(guild.threads)에 있고, 보관된 스레드는 REST로만 보임
+        thread = FakeThread(forum, name, archived, tags)
+        self._by_id[thread.id] = thread
+        if archived:
+            forum._archived_threads.append(thread)
+        else:
+            self.threads.append(thread)
+        return thread
+
+    def add_text_channel(self, name: str) -> FakeTextChannel:
+        channel = FakeTextChannel(self, name)
+        self._by_id[channel.id] = channel
+        self.text_channels.append(channel)
+        return channel
+
+    async def create_forum(self, name: str, category: Optional[FakeCategory] = None, available_tags=(), **kwargs) -> FakeForum:
+        await asyncio.sleep(self.rest_latency)
+        forum = self.add_forum(name, category, [tag.name for tag in available_tags])
+        for listener in self.listeners:
+            listener("create", forum, forum)
+        return forum
+
+    def emit_channel_update(self, before, after):
+        for listener in self.listeners:
+            listener("update", before, after)
+
+
+# 프로젝트가 많은 대형 서버를 생성 (프로젝트마다 이슈 스레드와 대화 메시지 포함)
+def build_guild(
+    projects: int,
+    completed_ratio: float = 0.3,
+    rest_latency: float = 0.05,
+    seed: int = 0,
+    threads_per_project: int = 0,
+    messages_per_thread: int = 0,
+    archived_ratio: float = 0.5,
+) -> FakeGuild:
+    rng = random.Random(seed)
+    words = ["web", "api", "mobile", "data", "infra", "bot", "docs", "지식", "베이스", "프로젝트", "분석", "검색", "디스코드", "자동화"]
+    tags = ["bug", "documentation", "duplicate", "enhancement", "good first issue", "help wanted", "invalid", "question", "wontfix"]
+    guild = FakeGuild(rest_latency=rest_latency)
+    users = [FakeUser(f"member-{i}") for i in range(20)]
+    active = guild.add_category(ACTIVE_CATEGORY)
+    completed = guild.add_category(COMPLETED_CATEGORY)
+    for i in range(projects):
+        name = "-".join(rng.sample(words, 2)) + f"-{i}"
+        forum = guild.add_forum(name, completed if rng.random() < completed_ratio else active, tags)
+        for j in range(threads_per_project):
+            thread_tags = rng.sample(list(forum.available_tags), rng.randint(0, 2))
+            thread = guild.add_thread(forum, f"issue-{j}", archived=rng.random() < archived_ratio, tags=thread_tags)
+            for k in range(messages_per_thread):
+                author = users[k % len(users)]
+                thread.messages.append(FakeMessage(thread, author, f"{' '.join(rng.sample(words, 3))} 메시지 {k}"))
+    return guild
+
+
+def fake_interaction(guild: FakeGuild, channel=None) -> SimpleNamespace:
+    return SimpleNamespace(guild=guild, channel=channel)
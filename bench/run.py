@@ -0,0 +1,332 @@
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# 실제 디스코드/n8n 없이 봇의 처리량을 측정하는 벤치마크
+#   python -m bench.run --projects 20000 --messages 5000 --output bench_output.json
+# 스풀/보관/검색 색인은 임시 디렉터리에 만들고 종료할 때 지움
+WORK_DIR = tempfile.mkdtemp(prefix="kb-bench-")
+atexit.register(shutil.rmtree, WORK_DIR, ignore_errors=True)
+os.environ["N8N_SPOOL_PATH"] = os.path.join(WORK_DIR, "spool.sqlite3")
+os.environ["ARCHIVE_PATH"] = os.path.join(WORK_DIR, "archive")
+os.environ.pop("SEARCH_INDEX_PATH", None)
+os.environ.setdefault("PAYLOAD_LOG_SAMPLE_RATE", "0")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+from bench.fakes import FakeMessage, FakeUser, build_guild, fake_interaction  # noqa: E402
+from bench.stub_n8n import StubN8n  # noqa: E402
+from cogs.admin_cog import AdminCog  # noqa: E402
+from cogs.project_cog import ProjectCog  # noqa: E402
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000 if ordered else 0.0
+
+    return {
+        "count": len(ordered),
+        "elapsed_s": round(elapsed, 4),
+        "per_sec": round(len(ordered) / elapsed, 2) if elapsed else None,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4) if ordered else 0.0,
+        "p50_ms": round(percentile(0.50), 4),
+        "p99_ms": round(percentile(0.99), 4),
+        "max_ms": round(ordered[-1] * 1000, 4) if ordered else 0.0,
+    }
+
+
+@contextmanager
+def allocations(result: dict, enabled: bool):
+    # 시나리오 동안의 메모리 할당 (tracemalloc이 켜지면 지연 시간도 늘어나므로 결과에 함께 기록)
+    if not enabled:
+        yield
+        return
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    try:
+        yield
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["alloc_net_kb"] = round((current - before) / 1024, 1)
+        result["alloc_peak_kb"] = round(peak / 1024, 1)
+
+
+def wire_bot(guild):
+    # 로그인 없이 봇이 가짜 서버를 보도록 연결
+    bot = main.bot
+    bot._connection.user = FakeUser("knowledge-bot", bot=True)
+    bot.get_guild = lambda guild_id: guild
+    main.GUILD_ID = guild.id
+    bot.projects.load_guild(guild)
+
+    def on_channel_event(kind, before, after):
+        if kind == "create":
+            bot.projects.on_channel_create(after)
+        else:
+            bot.projects.on_channel_update(before, after)
+
+    guild.listeners.append(on_channel_event)
+
+    async def react(channel_id: int, message_id: int, emoji: str):
+        channel = guild.get_channel(channel_id)
+        await bot.writes.add_reaction(FakeMessage(channel, bot.user, ""), emoji)
+
+    bot.dispatcher.react = react
+    return bot
+
+
+async def bench_on_message(bot, guild, stub: StubN8n, args) -> dict:
+    channels = [guild.add_text_channel(f"chat-{i}") for i in range(args.channels)]
+    users = [FakeUser(f"user-{i}") for i in range(50)]
+    rng = random.Random(1)
+    latencies = []
+    result: dict = {}
+
+    with allocations(result, args.alloc):
+        started = time.perf_counter()
+        # 버스트: burst개씩 동시에 도착하는 멘션 메시지
+        for offset in range(0, args.messages, args.burst):
+            batch = []
+            for _ in range(min(args.burst, args.messages - offset)):
+                channel = rng.choice(channels)
+                message = FakeMessage(channel, rng.choice(users), f"{bot.user.mention} 질문 {offset}", mentions=[bot.user])
+                channel.messages.append(message)
+                batch.append(message)
+
+            async def handle(message):
+                t0 = time.perf_counter()
+                await bot.on_message(message)
+                latencies.append(time.perf_counter() - t0)
+
+            await asyncio.gather(*(handle(message) for message in batch))
+        ingest_elapsed = time.perf_counter() - started
+
+        # 스풀이 비워질 때까지 (n8n 전송 완료까지) 대기
+        while bot.dispatcher.spool.depth and time.perf_counter() - started < args.timeout:
+            await asyncio.sleep(0.01)
+        delivered_elapsed = time.perf_counter() - started
+
+    result.update(summarize(latencies, ingest_elapsed))
+    result["delivered"] = stub.received
+    result["delivered_per_sec"] = round(stub.received / delivered_elapsed, 2) if delivered_elapsed else None
+    result["webhook_bytes"] = stub.bytes
+    result["history_cache"] = bot.history_cache.stats()
+    result["rest_history_calls"] = sum(channel.history_calls for channel in channels)
+    return result
+
+
+async def bench_autocomplete(bot, guild, args) -> dict:
+    project_cog = ProjectCog(bot)
+    admin_cog = AdminCog(bot)
+    forum = guild.forums[0]
+    rng = random.Random(2)
+    names = [forum.name for forum in guild.forums]
+    queries = [""] + [name[:rng.randint(1, 6)] for name in rng.sample(names, min(200, len(names)))] + ["ㅈㅅ", "프로ㅈ", "xyz"]
+
+    handlers = {
+        "ProjectCog.active_project_autocomplete": lambda current: project_cog.active_project_autocomplete(fake_interaction(guild), current),
+        "ProjectCog.completed_project_autocomplete": lambda current: project_cog.completed_project_autocomplete(fake_interaction(guild), current),
+        "AdminCog.active_project_autocomplete": lambda current: admin_cog.active_project_autocomplete(fake_interaction(guild), current),
+        "AdminCog.tag_autocomplete": lambda current: admin_cog.tag_autocomplete(fake_interaction(guild, forum), current),
+    }
+    results = {}
+    for name, handler in handlers.items():
+        latencies = []
+        result: dict = {}
+        with allocations(result, args.alloc):
+            started = time.perf_counter()
+            for _ in range(args.autocomplete_rounds):
+                for query in queries:
+                    t0 = time.perf_counter()
+                    await handler(query)
+                    latencies.append(time.perf_counter() - t0)
+            elapsed = time.perf_counter() - started
+        result.update(summarize(latencies, elapsed))
+        results[name] = result
+    return results
+
+
+async def bench_dashboard(bot, guild, args) -> dict:
+    # 연결 시 스레드 초기화(load_threads)와 상태 렌더링 비용
+    results = {}
+    for name, func in {
+        "load_threads": lambda: bot.dashboard.load_threads(guild),
+        "render_body": lambda: bot.dashboard.render_body(guild.id),
+    }.items():
+        latencies = []
+        result: dict = {}
+        with allocations(result, args.alloc):
+            started = time.perf_counter()
+            for _ in range(args.dashboard_rounds):
+                t0 = time.perf_counter()
+                func()
+                latencies.append(time.perf_counter() - t0)
+            elapsed = time.perf_counter() - started
+        result.update(summarize(latencies, elapsed))
+        results[name] = result
+    results["open_issues"] = len(bot.dashboard.guild(guild.id).thread_parent)
+    results["active_threads"] = len(guild.threads)
+    return results
+
+
+async def bench_archive(bot, guild, args) -> dict:
+    # 전체 스윕(처음)과 증분 스윕(체크포인트 이후만), 그리고 색인 검색 지연 시간
+    threads = guild.threads + [thread for forum in guild.forums for thread in forum._archived_threads]
+    results = {}
+    await asyncio.gather(bot.archiver.open(), bot.search.open())
+    try:
+        for name in ("full_sweep", "incremental_sweep"):
+            calls_before = sum(thread.history_calls for thread in threads)
+            result: dict = {}
+            with allocations(result, args.alloc):
+                result.update(await bot.archiver.sweep(guild))
+            result["history_calls"] = sum(thread.history_calls for thread in threads) - calls_before
+            results[name] = result
+        results["threads"] = len(threads)
+        results["documents"] = bot.search.stats()["documents"]
+
+        rng = random.Random(3)
+        queries = [thread.messages[0].content.split()[0] for thread in rng.sample(threads, min(50, len(threads))) if thread.messages]
+        latencies = []
+        started = time.perf_counter()
+        for query in queries:
+            t0 = time.perf_counter()
+            await bot.search.search(query, guild_id=guild.id)
+            latencies.append(time.perf_counter() - t0)
+        results["search"] = summarize(latencies, time.perf_counter() - started)
+    finally:
+        await bot.archiver.close()
+        await bot.search.close()
+    return results
+
+
+async def bench_api(bot, guild, args) -> dict:
+    transport = httpx.ASGITransport(app=main.app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def measure(name: str, count: int, request):
+            latencies = []
+            result: dict = {}
+            with allocations(result, args.alloc):
+                started = time.perf_counter()
+                for i in range(count):
+                    t0 = time.perf_counter()
+                    response = await request(i)
+                    latencies.append(time.perf_counter() - t0)
+                    if response.status_code >= 500:
+                        result["errors"] = result.get("errors", 0) + 1
+                elapsed = time.perf_counter() - started
+            result.update(summarize(latencies, elapsed))
+            results[name] = result
+
+        active_ids = [forum.id for forum in bot.projects.guild(guild.id).projects("active")]
+        names = {forum.id: forum.name for forum in guild.forums}
+        await measure("list_projects", args.api_requests, lambda i: client.get("/list_projects", params={"status": "active" if i % 2 else "completed"}))
+        await measure("complete_project_by_id", min(50, len(active_ids)), lambda i: client.post("/complete_project_by_id", json={"channel_id": active_ids[i]}))
+        await measure("reactivate_project", min(50, len(active_ids)), lambda i: client.post("/reactivate_project", json={"channel_name": names[active_ids[i]]}))
+        await measure("new_project", 20, lambda i: client.post("/new_project", json={"channel_name": f"bench-new-{i}", "guideline": "bench"}))
+
+        batch = [{"channel_id": channel_id} for channel_id in active_ids[50:50 + args.batch_size]]
+        await measure("batch_complete_projects", 1, lambda i: client.post("/batch/complete_projects", json={"projects": batch}))
+        results["batch_complete_projects"]["items"] = len(batch)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+
+async def run(args) -> dict:
+    stub = StubN8n(latency=args.n8n_latency, error_rate=args.n8n_error_rate)
+    await stub.start()
+    guild = build_guild(
+        args.projects,
+        rest_latency=args.rest_latency,
+        threads_per_project=args.threads_per_project,
+        messages_per_thread=args.thread_messages,
+    )
+    bot = wire_bot(guild)
+    bot.dispatcher.url = stub.url
+    await bot.dispatcher.start()
+
+    try:
+        scenarios = {}
+        if "on_message" in args.scenarios:
+            scenarios["on_message"] = await bench_on_message(bot, guild, stub, args)
+        if "autocomplete" in args.scenarios:
+            scenarios["autocomplete"] = await bench_autocomplete(bot, guild, args)
+        if "dashboard" in args.scenarios:
+            scenarios["dashboard"] = await bench_dashboard(bot, guild, args)
+        if "archive" in args.scenarios:
+            scenarios["archive"] = await bench_archive(bot, guild, args)
+        if "api" in args.scenarios:
+            scenarios["api"] = await bench_api(bot, guild, args)
+    finally:
+        await bot.dispatcher.close()
+        await stub.stop()
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "scenarios": scenarios,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test with a fake guild and a stub n8n server.")
+    parser.add_argument("--projects", type=int, default=5000, help="number of project forums in the fake guild")
+    parser.add_argument("--threads-per-project", type=int, default=2, help="issue threads per project forum (about half archived)")
+    parser.add_argument("--thread-messages", type=int, default=10, help="messages per issue thread")
+    parser.add_argument("--channels", type=int, default=50, help="number of chat channels receiving mentions")
+    parser.add_argument("--messages", type=int, default=2000, help="number of mention messages to send")
+    parser.add_argument("--burst", type=int, default=100, help="messages arriving at the same time")
+    parser.add_argument("--rest-latency", type=float, default=0.05, help="simulated Discord REST latency (s)")
+    parser.add_argument("--n8n-latency", type=float, default=0.05, help="stub n8n response latency (s)")
+    parser.add_argument("--n8n-error-rate", type=float, default=0.0, help="stub n8n 503 rate (0-1)")
+    parser.add_argument("--autocomplete-rounds", type=int, default=5)
+    parser.add_argument("--dashboard-rounds", type=int, default=20)
+    parser.add_argument("--api-requests", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=120.0, help="max seconds to wait for the spool to drain")
+    # archive는 스레드마다 REST history 지연이 쌓여 오래 걸리므로 기본 시나리오에서 제외
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=["on_message", "autocomplete", "dashboard", "api"],
+        choices=["on_message", "autocomplete", "dashboard", "archive", "api"],
+    )
+    parser.add_argument("--no-alloc", dest="alloc", action="store_false", help="disable tracemalloc allocation tracking")
+    parser.add_argument("--output", default="bench_output.json", help="where to write the JSON results")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = asyncio.run(run(arguments))
+    with open(arguments.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report["scenarios"], ensure_ascii=False, indent=2))
+    print(f"결과를 {arguments.output}에 저장했습니다.")
@@ -0,0 +1,48 @@
+import asyncio
+import random
+import socket
+
+from aiohttp import web
+
+
+# 지연 시간과 오류율을 조절할 수 있는 로컬 n8n 웹훅 대역
+class StubN8n:
+    def __init__(self, latency: float = 0.05, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.received = 0
+        self.failed = 0
+        self.bytes = 0
+        self._rng = random.Random(seed)
+        self._runner = None
+        self.port = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/webhook"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        await asyncio.sleep(self.latency)
+        if self._rng.random() < self.error_rate:
+            self.failed += 1
+            return web.Response(status=503)
+        self.received += 1
+        self.bytes += len(body)
+        return web.json_response({"ok": True})
+
+    async def start(self, port: int = 0):
+        if not port:
+            with socket.socket() as sock:
+                sock.bind(("127.0.0.1", 0))
+                port = sock.getsockname()[1]
+        self.port = port
+        app = web.Application()
+        app.router.add_post("/webhook", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", port).start()
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
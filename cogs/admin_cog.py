@@ -2,18 +2,16 @@ import discord
 from discord import app_commands, ui
 from discord.ext import commands
 
+from core.write_scheduler import INTERACTIVE
+
 class AdminCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
     # --- Autocomplete Functions ---
     async def active_project_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
-        category = discord.utils.get(interaction.guild.categories, name="--- Active Projects ---")
-        if not category:
-            return []
-        projects = [channel.name for channel in category.forums]
-        filtered_projects = [project for project in projects if current.lower() in project.lower()]
-        return [app_commands.Choice(name=project, value=project) for project in filtered_projects[:25]]
+        projects = self.bot.autocomplete.projects(interaction.guild.id, "active", current)
+        return [app_commands.Choice(name=project, value=project) for project in projects]
 
     async def tag_autocomplete(self, interaction: discord.Interaction, current: str) -> list[app_commands.Choice[str]]:
         try:
@@ -24,10 +22,8 @@ class AdminCog(commands.Cog):
             if not isinstance(channel, discord.ForumChannel):
                 return []
             
-            tags = [tag.name for tag in channel.available_tags]
-            filtered_tags = [tag for tag in tags if current.lower() in tag.lower()]
-            
-            return [app_commands.Choice(name=tag, value=tag) for tag in filtered_tags[:25]]
+            tags = self.bot.autocomplete.tags(channel, current)
+            return [app_commands.Choice(name=tag, value=tag) for tag in tags]
         except Exception as e:
             print(f"ERROR in tag_autocomplete: {e}")
             return []
@@ -92,11 +88,13 @@ class AdminCog(commands.Cog):
                 await interaction.followup.send("오류: 이 명령어는 포럼 채널 또는 그 게시물 안에서만 사용할 수 있습니다.")
                 return
 
-            new_tag = discord.ForumTag(name=name, emoji=emoji)
-            current_tags = list(channel.available_tags)
-            current_tags.append(new_tag)
+            if any(tag.name == name for tag in channel.available_tags):
+                await interaction.followup.send(f"'{name}' 태그가 이미 있습니다.")
+                return
 
-            await channel.edit(available_tags=current_tags)
+            # 같은 포럼에 대한 태그 변경이 겹치면 스케줄러가 하나의 edit로 합쳐서 반영
+            new_tag = discord.ForumTag(name=name, emoji=emoji)
+            await self.bot.writes.update_tags(channel, add=[new_tag], priority=INTERACTIVE)
             await interaction.followup.send(f"태그 '{name}'을(를) 추가했습니다.")
 
         except Exception as e:
@@ -118,13 +116,11 @@ class AdminCog(commands.Cog):
                 await interaction.followup.send("오류: 이 명령어는 포럼 채널 또는 그 게시물 안에서만 사용할 수 있습니다.")
                 return
 
-            new_tags = [tag for tag in channel.available_tags if tag.name != name]
-            
-            if len(new_tags) == len(channel.available_tags):
+            if not any(tag.name == name for tag in channel.available_tags):
                 await interaction.followup.send(f"'{name}' 태그를 찾을 수 없습니다.")
                 return
 
-            await channel.edit(available_tags=new_tags)
+            await self.bot.writes.update_tags(channel, remove=[name], priority=INTERACTIVE)
             await interaction.followup.send(f"태그 '{name}'을(를) 삭제했습니다.")
         except Exception as e:
             print(f"ERROR in /tag remove: {e}")
@@ -0,0 +1,63 @@
+import os
+from typing import Optional
+
+import discord
+from discord.ext import commands, tasks
+
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "3600"))
+
+class ArchiveCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.archiver = bot.archiver
+
+    async def cog_load(self):
+        self.sweep_loop.change_interval(seconds=ARCHIVE_INTERVAL)
+        self.sweep_loop.start()
+
+    async def cog_unload(self):
+        self.sweep_loop.cancel()
+
+    def thread_of(self, channel_id: int) -> Optional[discord.Thread]:
+        channel = self.bot.get_channel(channel_id)
+        return channel if isinstance(channel, discord.Thread) else None
+
+    # --- Listeners ---
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # 새 세션(재연결 포함)에서는 다음 스윕 전까지 실시간 메시지로 체크포인트를 옮기지 않음
+        self.archiver.reset_session()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        await self.archiver.message_created(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        await self.archiver.message_edited(payload, self.thread_of(payload.channel_id))
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        await self.archiver.message_deleted({payload.message_id}, self.thread_of(payload.channel_id))
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        await self.archiver.message_deleted(payload.message_ids, self.thread_of(payload.channel_id))
+
+    # --- Sweeps ---
+    # 주기마다 모든 서버의 프로젝트 포럼을 훑어, 체크포인트 이후의 새 메시지만 보관
+    @tasks.loop(seconds=3600)
+    async def sweep_loop(self):
+        for guild in list(self.bot.guilds):
+            try:
+                result = await self.archiver.sweep(guild)
+                print(f"[archive] {guild.name}: {result}")
+            except Exception as e:
+                print(f"ERROR in archive sweep: {e}")
+
+    @sweep_loop.before_loop
+    async def before_sweep_loop(self):
+        await self.bot.wait_until_ready()
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(ArchiveCog(bot))
@@ -0,0 +1,148 @@
+import os
+import time
+
+import discord
+from discord.ext import commands, tasks
+
+from core.dashboard import HOW_TO_USE_CHANNEL, STATUS_HEADER
+from core.write_scheduler import BACKGROUND
+
+DASHBOARD_INTERVAL = float(os.getenv("DASHBOARD_INTERVAL", "60"))
+# 상태 메시지가 없는 서버를 다시 찾아보는 최대 간격 (고정/채널 이벤트가 오면 바로 다시 찾음)
+LOCATE_BACKOFF_MAX = 6 * 3600
+
+class DashboardCog(commands.Cog):
+    def __init__(self, bot: commands.Bot):
+        self.bot = bot
+        self.dashboard = bot.dashboard
+        # 길드별 대시보드 메시지의 마지막 내용 (수정할 때마다 메시지를 다시 읽지 않기 위함)
+        self.templates: dict[int, str] = {}
+
+    async def cog_load(self):
+        self.publish_loop.change_interval(seconds=DASHBOARD_INTERVAL)
+        self.publish_loop.start()
+
+    async def cog_unload(self):
+        self.publish_loop.cancel()
+
+    # --- Listeners ---
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        self.dashboard.load_threads(guild)
+
+    @commands.Cog.listener()
+    async def on_thread_create(self, thread: discord.Thread):
+        self.dashboard.thread_opened(thread.guild.id, thread.id, thread.parent_id)
+
+    @commands.Cog.listener()
+    async def on_raw_thread_update(self, payload: discord.RawThreadUpdateEvent):
+        if payload.data.get("thread_metadata", {}).get("archived"):
+            self.dashboard.thread_closed(payload.guild_id, payload.thread_id)
+        else:
+            self.dashboard.thread_opened(payload.guild_id, payload.thread_id, payload.parent_id)
+
+    @commands.Cog.listener()
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
+        self.dashboard.thread_closed(payload.guild_id, payload.thread_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_pins_update(self, channel: discord.abc.GuildChannel, last_pin):
+        if channel.name == HOW_TO_USE_CHANNEL:
+            self.rescan(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if channel.name == HOW_TO_USE_CHANNEL:
+            self.rescan(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if after.name == HOW_TO_USE_CHANNEL:
+            self.rescan(after.guild.id)
+
+    # --- Publishing ---
+    # 상태가 바뀐 길드만, 주기당 최대 한 번 고정 메시지를 수정
+    @tasks.loop(seconds=60)
+    async def publish_loop(self):
+        for guild_id in self.dashboard.guild_ids():
+            if not self.dashboard.refresh(guild_id):
+                continue
+            try:
+                published = await self.publish(guild_id)
+            except Exception as e:
+                print(f"ERROR in dashboard publish: {e}")
+                published = False
+            if not published:
+                # 다음 주기에 다시 시도
+                self.dashboard.guild(guild_id).last_body = None
+
+    @publish_loop.before_loop
+    async def before_publish_loop(self):
+        await self.bot.wait_until_ready()
+
+    async def locate(self, guild: discord.Guild) -> bool:
+        # 상태 섹션이 들어있는 봇 메시지를 찾아 고정 (처음 한 번 또는 메시지가 바뀐 뒤에만)
+        state = self.dashboard.guild(guild.id)
+        if time.monotonic() < state.locate_after:
+            return False
+        channel = discord.utils.get(guild.text_channels, name=HOW_TO_USE_CHANNEL)
+        if channel is None:
+            return False
+        candidates = await channel.pins()
+        message = next((m for m in candidates if m.author == self.bot.user and STATUS_HEADER in m.content), None)
+        if message is None:
+            async for m in channel.history(limit=100):
+                if m.author == self.bot.user and STATUS_HEADER in m.content:
+                    message = m
+                    break
+        if message is None:
+            # 없으면 다음 주기마다 pins/history를 다시 읽지 않도록 간격을 늘림
+            state.locate_misses += 1
+            state.locate_after = time.monotonic() + min(DASHBOARD_INTERVAL * 2 ** state.locate_misses, LOCATE_BACKOFF_MAX)
+            return False
+        state.locate_misses = 0
+        if not message.pinned:
+            await self.bot.writes.submit(("pin", channel.id), message.pin, BACKGROUND)
+        state.channel_id = channel.id
+        state.message_id = message.id
+        self.templates[guild.id] = message.content
+        return True
+
+    async def publish(self, guild_id: int) -> bool:
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return False
+        state = self.dashboard.guild(guild_id)
+        if state.message_id is None and not await self.locate(guild):
+            return False
+
+        current = self.templates[guild_id]
+        content = self.dashboard.apply(guild_id, current)
+        if content == current:
+            return True
+        message = self.bot.get_partial_messageable(state.channel_id).get_partial_message(state.message_id)
+        try:
+            await self.bot.writes.submit(("message", state.channel_id), lambda: message.edit(content=content), BACKGROUND)
+            self.templates[guild_id] = content
+            return True
+        except discord.NotFound:
+            # 메시지가 삭제된 경우 다음 주기에 다시 찾음
+            state.message_id = None
+            return False
+
+    def rescan(self, guild_id: int):
+        # 다음 주기에 상태 메시지를 바로 다시 찾음
+        state = self.dashboard.guild(guild_id)
+        state.locate_misses = 0
+        state.locate_after = 0.0
+        if state.message_id is None:
+            state.last_body = None
+
+    def forget(self, guild_id: int):
+        # /setup이 메시지를 다시 게시한 뒤 호출
+        self.dashboard.guild(guild_id).message_id = None
+        self.templates.pop(guild_id, None)
+        self.rescan(guild_id)
+
+async def setup(bot: commands.Bot):
+    await bot.add_cog(DashboardCog(bot))
@@ -1,35 +1,90 @@
+import asyncio
+import datetime
+import hashlib
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from core.dashboard import HOW_TO_USE_CHANNEL
+from core.text import split_message
+from core.write_scheduler import INTERACTIVE
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.strip().encode("utf-8")).hexdigest()
+
 class SetupCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    # --- Helpers ---
+    async def ensure_category(self, guild: discord.Guild, category_name: str) -> discord.CategoryChannel:
+        category = self.bot.projects.guild(guild.id).categories.get(category_name)
+        if category:
+            return category
+        return await self.bot.writes.submit(("create_channel", guild.id), lambda: guild.create_category(category_name), INTERACTIVE)
+
+    async def ensure_how_to_use_channel(self, guild: discord.Guild, channel_name: str) -> discord.TextChannel:
+        existing_channel = discord.utils.get(guild.text_channels, name=channel_name)
+        if existing_channel:
+            return existing_channel
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(send_messages=False, create_public_threads=False),
+            guild.me: discord.PermissionOverwrite(send_messages=True, manage_messages=True)
+        }
+        return await self.bot.writes.submit(("create_channel", guild.id), lambda: guild.create_text_channel(channel_name, overwrites=overwrites), INTERACTIVE)
+
+    async def purge_messages(self, channel: discord.TextChannel, messages: list[discord.Message]):
+        # 14일 이내 메시지는 100개씩 일괄 삭제, 그보다 오래된 메시지는 하나씩 삭제
+        cutoff = discord.utils.utcnow() - datetime.timedelta(days=14)
+        recent = [message for message in messages if message.created_at > cutoff]
+        old = [message for message in messages if message.created_at <= cutoff]
+        for i in range(0, len(recent), 100):
+            batch = recent[i:i + 100]
+            await self.bot.writes.submit(("delete_message", channel.id), lambda: channel.delete_messages(batch), INTERACTIVE)
+        for message in old:
+            await self.bot.writes.delete_message(message, priority=INTERACTIVE)
+
+    async def publish(self, channel: discord.TextChannel, chunks: list[str]) -> dict:
+        # 이미 게시된 메시지와 내용 해시를 비교해 바뀐 메시지만 수정
+        # (고정 알림 같은 시스템 메시지는 작성자가 봇이어도 수정할 수 없으므로 제외)
+        existing = [
+            message async for message in channel.history(limit=100, oldest_first=True)
+            if message.author == self.bot.user and message.type is discord.MessageType.default
+        ]
+        counts = {"unchanged": 0, "edited": 0, "sent": 0, "deleted": 0}
+        for index, chunk in enumerate(chunks):
+            if index < len(existing):
+                message = existing[index]
+                if content_hash(message.content) == content_hash(chunk):
+                    counts["unchanged"] += 1
+                    continue
+                await self.bot.writes.submit(("message", channel.id), lambda: message.edit(content=chunk), INTERACTIVE)
+                counts["edited"] += 1
+            else:
+                await self.bot.writes.send_message(channel, priority=INTERACTIVE, content=chunk)
+                counts["sent"] += 1
+
+        leftovers = existing[len(chunks):]
+        if leftovers:
+            await self.purge_messages(channel, leftovers)
+            counts["deleted"] = len(leftovers)
+        return counts
+
     @app_commands.command(name="setup", description="서버에 봇의 기본 환경을 설정합니다.")
     @app_commands.default_permissions(administrator=True)
     async def setup_command(self, interaction: discord.Interaction):
         guild = interaction.guild
         await interaction.response.defer(thinking=True)
 
-        # 1. 카테고리 생성
-        for category_name in ["Active Projects", "Completed Projects"]:
-            if not discord.utils.get(guild.categories, name=category_name):
-                await guild.create_category(category_name)
+        # 1. 카테고리와 how-to-use 채널을 동시에 확인/생성 (이미 있으면 API 호출 없음)
+        channel_name = HOW_TO_USE_CHANNEL
+        *_, channel = await asyncio.gather(
+            *(self.ensure_category(guild, category_name) for category_name in self.bot.guild_config.get(guild.id).categories.values()),
+            self.ensure_how_to_use_channel(guild, channel_name),
+        )
 
-        # 2. how-to-use 채널 생성 및 권한 설정
-        channel_name = "how-to-use"
-        existing_channel = discord.utils.get(guild.text_channels, name=channel_name)
-        if not existing_channel:
-            overwrites = {
-                guild.default_role: discord.PermissionOverwrite(send_messages=False, create_public_threads=False),
-                guild.me: discord.PermissionOverwrite(send_messages=True, manage_messages=True)
-            }
-            channel = await guild.create_text_channel(channel_name, overwrites=overwrites)
-        else:
-            channel = existing_channel
-
-        # 3. 기존 메시지 삭제 후 HOW_TO_USE.md 파일 내용 게시
+        # 2. HOW_TO_USE.md 내용을 2000자 단위로 나눠, 바뀐 부분만 반영
         try:
             with open("HOW_TO_USE.md", "r", encoding="utf-8") as f:
                 how_to_use_content = f.read()
@@ -37,12 +92,14 @@ class SetupCog(commands.Cog):
             await interaction.followup.send("HOW_TO_USE.md 파일을 찾을 수 없습니다.")
             return
 
-        async for message in channel.history(limit=100):
-            if message.author == self.bot.user:
-                await message.delete()
-                
-        await channel.send(how_to_use_content)
-        
+        # 상태 섹션은 대시보드가 마지막으로 게시한 내용으로 채워서 비교 (상태가 그대로면 수정하지 않음)
+        chunks = [self.bot.dashboard.apply(guild.id, chunk) for chunk in split_message(how_to_use_content)]
+        counts = await self.publish(channel, chunks)
+        print(f"[setup] #{channel_name}: {counts}")
+        dashboard_cog = self.bot.get_cog("DashboardCog")
+        if dashboard_cog and (counts["edited"] or counts["sent"] or counts["deleted"]):
+            dashboard_cog.forget(guild.id)
+
         await interaction.followup.send(f"`#{channel_name}` 채널과 카테고리 설정이 완료되었습니다.")
 
 async def setup(bot: commands.Bot):
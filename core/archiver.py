@@ -0,0 +1,305 @@
+import asyncio
+import datetime
+import gzip
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+import discord
+
+from core.project_registry import ProjectRegistry
+
+
+def message_record(message: discord.Message, forum: discord.ForumChannel) -> dict:
+    thread = message.channel
+    tags = [tag.name for tag in getattr(thread, "applied_tags", ())]
+    return {
+        "event": "message",
+        "id": message.id,
+        "guild_id": forum.guild.id,
+        "project_id": forum.id,
+        "project": forum.name,
+        "thread_id": thread.id,
+        "thread": thread.name,
+        "tags": tags,
+        "author_id": message.author.id,
+        "author": message.author.display_name,
+        "bot": message.author.bot,
+        "content": message.content,
+        "attachments": [attachment.url for attachment in message.attachments],
+        "created_at": message.created_at.isoformat(),
+        "edited_at": message.edited_at.isoformat() if message.edited_at else None,
+    }
+
+
+# 날짜별로 나눈 gzip JSONL 파일에 기록: {root}/{guild_id}/{YYYY-MM-DD}/{project_id}.jsonl.gz
+# 호출마다 gzip 멤버 하나를 덧붙이므로 (zcat/gzip.open으로 그대로 읽힘) 기존 파일을 다시 쓰지 않음
+class ArchiveWriter:
+    def __init__(self, root: str):
+        self.root = root
+        self.records = 0
+        self._lock = asyncio.Lock()
+
+    def _path(self, record: dict) -> str:
+        day = (record.get("created_at") or record["archived_at"])[:10]
+        return os.path.join(self.root, str(record["guild_id"]), day, f"{record['project_id']}.jsonl.gz")
+
+    def _write(self, records: list[dict]):
+        by_path: dict[str, list[str]] = {}
+        for record in records:
+            by_path.setdefault(self._path(record), []).append(json.dumps(record, ensure_ascii=False))
+        for path, lines in by_path.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(path, "at", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+    async def write(self, records: list[dict]):
+        if not records:
+            return
+        # 같은 파일에 동시에 덧붙이지 않도록 한 번에 하나씩 기록
+        async with self._lock:
+            await asyncio.to_thread(self._write, records)
+        self.records += len(records)
+
+
+# 스레드별로 마지막으로 보관한 메시지 ID (다음 실행은 after=로 그 이후만 읽음)
+class ArchiveCheckpoints:
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._cache: dict[int, int] = {}
+
+    async def open(self):
+        self._conn = await asyncio.to_thread(self._open)
+        self._cache = dict(await asyncio.to_thread(self._load))
+
+    def _open(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            " thread_id INTEGER PRIMARY KEY,"
+            " last_message_id INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        return conn
+
+    def _load(self) -> list[tuple]:
+        return self._conn.execute("SELECT thread_id, last_message_id FROM checkpoints").fetchall()
+
+    async def close(self):
+        if self._conn is not None:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+    def get(self, thread_id: int) -> Optional[int]:
+        return self._cache.get(thread_id)
+
+    async def advance(self, thread_id: int, message_id: int):
+        # 체크포인트는 앞으로만 움직임
+        if self._cache.get(thread_id, 0) >= message_id:
+            return
+        self._cache[thread_id] = message_id
+        await asyncio.to_thread(
+            self._conn.execute,
+            "INSERT INTO checkpoints (thread_id, last_message_id, updated_at) VALUES (?, ?, ?)"
+            " ON CONFLICT(thread_id) DO UPDATE SET last_message_id = MAX(last_message_id, excluded.last_message_id), updated_at = excluded.updated_at",
+            (thread_id, message_id, time.time()),
+        )
+
+
+# 프로젝트 포럼의 모든 스레드를 지식 베이스(로컬 경로)로 보관
+# - 전체 스윕: 포럼 → 스레드(활성 + 보관됨) 순으로 훑고, 스레드마다 체크포인트 이후 메시지만 읽음
+# - 메모리: 스레드 큐와 스레드당 batch_size개의 버퍼만 사용하므로 기록 양과 상관없이 일정
+# - 실시간: 스윕을 마친 스레드와 새 스레드는 게이트웨이 이벤트로 바로 기록하고 체크포인트도 함께 이동
+#   (스윕 전인 스레드의 메시지는 다음 스윕에서 기록)
+#   기록이 실패하면 그 스레드를 스윕 전 상태로 되돌려, 체크포인트가 실패한 메시지를 넘지 않고 다음 스윕이 거기서부터 읽음
+# - 리스너(archived(records))로 검색 색인 등에 기록을 전달
+class Archiver:
+    def __init__(self, projects: ProjectRegistry, root: str, concurrency: int = 4, batch_size: int = 100):
+        self.projects = projects
+        self.root = root
+        self.concurrency = max(1, concurrency)
+        self.batch_size = batch_size
+        self.writer = ArchiveWriter(root)
+        self.checkpoints = ArchiveCheckpoints(os.path.join(root, "checkpoints.sqlite3"))
+        self.listeners: list = []
+        # 이번 연결에서 스윕을 마친 스레드 (이후의 실시간 메시지는 빠짐없이 이어짐)
+        self._swept: set[int] = set()
+        # 스레드별 실시간 기록 순서를 지키는 잠금과 그 잠금을 기다리는 이벤트 수
+        self._live: dict[int, tuple[asyncio.Lock, list[int]]] = {}
+        self.sweeping = False
+        self.threads_archived = 0
+        self.threads_skipped = 0
+        self.threads_failed = 0
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    async def open(self):
+        await self.checkpoints.open()
+
+    async def close(self):
+        await self.checkpoints.close()
+
+    def project_of(self, guild_id: Optional[int], parent_id: Optional[int]) -> Optional[discord.ForumChannel]:
+        if guild_id is None or parent_id is None or guild_id not in self.projects:
+            return None
+        return self.projects.guild(guild_id).get(parent_id)
+
+    def reset_session(self):
+        # 새 게이트웨이 세션에서는 놓친 이벤트가 있을 수 있으므로 다음 스윕까지 실시간 체크포인트를 멈춤
+        self._swept.clear()
+
+    async def _emit(self, records: list[dict]):
+        await self.writer.write(records)
+        for listener in self.listeners:
+            try:
+                await listener.archived(records)
+            except Exception as e:
+                print(f"[archive] 리스너 처리 실패: {e}")
+
+    # --- 전체 스윕 ---
+    async def sweep(self, guild: discord.Guild) -> dict:
+        started = time.perf_counter()
+        archived_before = self.writer.records
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        self.sweeping = True
+
+        async def worker():
+            while True:
+                item = await queue.get()
+                try:
+                    if item is None:
+                        return
+                    await self.archive_thread(*item)
+                except Exception as e:
+                    # 한 스레드의 실패(네트워크, 파일, DB 오류)로 워커가 죽지 않도록 기록만 하고 다음 스레드로 넘어감
+                    # (체크포인트는 기록된 배치까지만 옮겨졌으므로 다음 스윕에서 이어서 읽음)
+                    self.threads_failed += 1
+                    print(f"[archive] 스레드 {item[0].id} 보관 실패: {e!r}")
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            for forum in list(self.projects.guild(guild.id).by_id.values()):
+                for thread in forum.threads:
+                    await queue.put((thread, forum))
+                try:
+                    async for thread in forum.archived_threads(limit=None):
+                        await queue.put((thread, forum))
+                except discord.HTTPException as e:
+                    print(f"[archive] 포럼 {forum.name} 보관 스레드 조회 실패: {e}")
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            self.sweeping = False
+        return {
+            "records": self.writer.records - archived_before,
+            "elapsed_s": round(time.perf_counter() - started, 2),
+        }
+
+    async def archive_thread(self, thread: discord.Thread, forum: discord.ForumChannel):
+        checkpoint = self.checkpoints.get(thread.id)
+        if checkpoint is not None and thread.last_message_id is not None and thread.last_message_id <= checkpoint:
+            self.threads_skipped += 1
+            self._swept.add(thread.id)
+            return
+
+        after = discord.Object(id=checkpoint) if checkpoint is not None else None
+        batch: list[dict] = []
+        async for message in thread.history(limit=None, after=after, oldest_first=True):
+            batch.append(message_record(message, forum))
+            if len(batch) >= self.batch_size:
+                await self._flush(thread.id, batch)
+                batch = []
+        await self._flush(thread.id, batch)
+        self.threads_archived += 1
+        self._swept.add(thread.id)
+
+    async def _flush(self, thread_id: int, batch: list[dict]):
+        # 스윕 도중 실시간 이벤트로 이미 기록된 메시지는 뺌 (체크포인트까지는 모두 기록되어 있음)
+        checkpoint = self.checkpoints.get(thread_id)
+        if checkpoint is not None:
+            batch = [record for record in batch if record["id"] > checkpoint]
+        if not batch:
+            return
+        # 기록이 끝난 뒤에 체크포인트를 옮기므로, 중간에 멈추면 그 배치부터 다시 읽음
+        await self._emit(batch)
+        await self.checkpoints.advance(thread_id, batch[-1]["id"])
+
+    # --- 실시간 이벤트 ---
+    async def message_created(self, message: discord.Message):
+        thread = message.channel
+        if not isinstance(thread, discord.Thread) or message.guild is None:
+            return
+        forum = self.project_of(message.guild.id, thread.parent_id)
+        if forum is None:
+            return
+        lock, waiting = self._live.setdefault(thread.id, (asyncio.Lock(), [0]))
+        waiting[0] += 1
+        try:
+            # 같은 스레드의 메시지는 도착 순서대로 하나씩 기록 (앞 메시지가 실패하면 뒤 메시지가 체크포인트를 넘기지 않도록)
+            async with lock:
+                # 포럼 스레드의 시작 메시지는 스레드와 ID가 같으므로, 체크포인트가 없으면 방금 만들어진 스레드임
+                if thread.id not in self._swept:
+                    if message.id != thread.id or self.checkpoints.get(thread.id) is not None:
+                        # 아직 스윕하지 않은 스레드는 다음 스윕이 체크포인트부터 읽으므로 여기서 기록하면 중복됨
+                        return
+                    self._swept.add(thread.id)
+                try:
+                    await self._emit([message_record(message, forum)])
+                    await self.checkpoints.advance(thread.id, message.id)
+                except Exception:
+                    # 체크포인트는 실패한 메시지 직전에 머물러 있으므로, 이후 메시지도 다음 스윕에 맡김
+                    self._swept.discard(thread.id)
+                    raise
+        finally:
+            waiting[0] -= 1
+            if not waiting[0]:
+                del self._live[thread.id]
+
+    async def message_edited(self, payload: discord.RawMessageUpdateEvent, thread: Optional[discord.Thread]):
+        if "content" not in payload.data or thread is None:
+            return
+        forum = self.project_of(payload.guild_id, thread.parent_id)
+        if forum is None:
+            return
+        await self._emit([self._event_record("edit", payload.message_id, thread, forum, content=payload.data["content"], edited_at=payload.data.get("edited_timestamp"))])
+
+    async def message_deleted(self, message_ids: set[int], thread: Optional[discord.Thread]):
+        if thread is None:
+            return
+        forum = self.project_of(thread.guild.id, thread.parent_id)
+        if forum is None:
+            return
+        await self._emit([self._event_record("delete", message_id, thread, forum) for message_id in sorted(message_ids)])
+
+    @staticmethod
+    def _event_record(event: str, message_id: int, thread: discord.Thread, forum: discord.ForumChannel, **fields) -> dict:
+        # 수정/삭제는 원본 기록을 고치지 않고 이벤트로 덧붙임 (이벤트가 일어난 날짜의 파티션)
+        return {
+            "event": event,
+            "id": message_id,
+            "guild_id": forum.guild.id,
+            "project_id": forum.id,
+            "thread_id": thread.id,
+            "archived_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            **fields,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "records": self.writer.records,
+            "threads_archived": self.threads_archived,
+            "threads_skipped": self.threads_skipped,
+            "threads_failed": self.threads_failed,
+            "sweeping": self.sweeping,
+        }
@@ -0,0 +1,253 @@
+import bisect
+import heapq
+import unicodedata
+from typing import Iterable, Optional
+
+import discord
+
+from core.metrics import metrics
+
+AUTOCOMPLETE_LATENCY = metrics.histogram("autocomplete_seconds", "Autocomplete lookup latency.", ("kind",))
+
+# --- 한글 자모 분해 ---
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = ["ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ", "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ"]
+JONGSEONG = ["", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ", "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ"]
+# 입력 중인 겹자모(ㄳ, ㅘ 등)도 분해해서 비교
+COMPOUND_JAMO = {"ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+                 "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ"}
+SEPARATORS = str.maketrans("", "", " -_")
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFC", text).casefold().translate(SEPARATORS)
+
+
+def to_jamo(text: str) -> str:
+    parts = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            index = code - HANGUL_BASE
+            parts.append(CHOSEONG[index // 588])
+            parts.append(JUNGSEONG[(index % 588) // 28])
+            parts.append(JONGSEONG[index % 28])
+        else:
+            parts.append(COMPOUND_JAMO.get(char, char))
+    return "".join(parts)
+
+
+def to_choseong(text: str) -> str:
+    parts = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            parts.append(CHOSEONG[(code - HANGUL_BASE) // 588])
+        else:
+            parts.append(char)
+    return "".join(parts)
+
+
+def is_choseong_query(text: str) -> bool:
+    return any(char in CHOSEONG for char in text) and all(char in CHOSEONG or char.isascii() for char in text)
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# 이름 목록에 대한 자동완성 색인
+# - 정규화된 검색 키(자모 분해, 초성)를 미리 계산해 두고
+# - 접두사는 정렬 리스트 + bisect, 부분/유사 일치는 trigram 색인으로 찾음
+# - 결과 순위: 정확히 일치 > 접두사 > 부분 문자열 > 초성 > 유사 일치, 같은 순위 안에서는 최근 활동 순
+class AutocompleteIndex:
+    def __init__(self):
+        self._entries: dict[int, tuple[str, str, str, int]] = {}  # key -> (이름, 자모 키, 초성 키, 최근성)
+        self._sorted: list[tuple[str, int]] = []
+        self._sorted_choseong: list[tuple[str, int]] = []
+        self._trigrams: dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, key: int, name: str, recency: int = 0):
+        existing = self._entries.get(key)
+        if existing is not None:
+            if existing[0] == name:
+                self._entries[key] = (*existing[:3], recency)
+                return
+            self.remove(key)
+        normalized = normalize(name)
+        jamo = to_jamo(normalized)
+        choseong = to_choseong(normalized)
+        self._entries[key] = (name, jamo, choseong, recency)
+        bisect.insort(self._sorted, (jamo, key))
+        bisect.insort(self._sorted_choseong, (choseong, key))
+        for gram in trigrams(jamo):
+            self._trigrams.setdefault(gram, set()).add(key)
+
+    def remove(self, key: int):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        _, jamo, choseong, _ = entry
+        self._discard_sorted(self._sorted, (jamo, key))
+        self._discard_sorted(self._sorted_choseong, (choseong, key))
+        for gram in trigrams(jamo):
+            keys = self._trigrams.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._trigrams[gram]
+
+    def touch(self, key: int, recency: int):
+        entry = self._entries.get(key)
+        if entry is not None and recency > entry[3]:
+            self._entries[key] = (*entry[:3], recency)
+
+    def keys(self) -> list[int]:
+        return list(self._entries)
+
+    @staticmethod
+    def _discard_sorted(items: list, item: tuple):
+        index = bisect.bisect_left(items, item)
+        if index < len(items) and items[index] == item:
+            del items[index]
+
+    @staticmethod
+    def _prefix_range(items: list, prefix: str) -> Iterable[int]:
+        start = bisect.bisect_left(items, (prefix,))
+        for index in range(start, len(items)):
+            value, key = items[index]
+            if not value.startswith(prefix):
+                break
+            yield key
+
+    def search(self, query: str, limit: int = 25) -> list[str]:
+        normalized = normalize(query)
+        if not normalized:
+            recent = heapq.nlargest(limit, self._entries.values(), key=lambda entry: entry[3])
+            return [entry[0] for entry in recent]
+
+        jamo = to_jamo(normalized)
+        ranked: dict[int, tuple[int, float]] = {}  # key -> (순위, 보조 점수)
+
+        def offer(key: int, tier: int, score: float = 0.0):
+            current = ranked.get(key)
+            if current is None or (tier, -score) < (current[0], -current[1]):
+                ranked[key] = (tier, score)
+
+        for key in self._prefix_range(self._sorted, jamo):
+            offer(key, 0 if self._entries[key][1] == jamo else 1)
+
+        if len(ranked) < limit:
+            grams = trigrams(jamo)
+            if grams:
+                counts: dict[int, int] = {}
+                for gram in grams:
+                    for key in self._trigrams.get(gram, ()):
+                        counts[key] = counts.get(key, 0) + 1
+                for key, count in counts.items():
+                    if key in ranked:
+                        continue
+                    if jamo in self._entries[key][1]:
+                        offer(key, 2)
+                    elif count / len(grams) >= 0.5:
+                        offer(key, 4, count / len(grams))
+            else:
+                # trigram을 만들 수 없는 짧은 입력은 부분 문자열로 직접 비교
+                for key, entry in self._entries.items():
+                    if key not in ranked and jamo in entry[1]:
+                        offer(key, 2)
+
+        if is_choseong_query(normalized):
+            for key in self._prefix_range(self._sorted_choseong, normalized):
+                offer(key, 3)
+            if len(ranked) < limit:
+                for key, entry in self._entries.items():
+                    if key not in ranked and normalized in entry[2]:
+                        offer(key, 3, -1.0)
+
+        best = heapq.nsmallest(
+            limit,
+            ranked.items(),
+            key=lambda item: (item[1][0], -item[1][1], -self._entries[item[0]][3], self._entries[item[0]][0]),
+        )
+        return [self._entries[key][0] for key, _ in best]
+
+
+# 프로젝트/태그 자동완성 서비스 (봇 전체에서 공유)
+# ProjectRegistry의 변경 알림을 받아 색인을 점진적으로 갱신함
+class AutocompleteService:
+    def __init__(self):
+        self._projects: dict[tuple[int, str], AutocompleteIndex] = {}
+        self._project_status: dict[tuple[int, int], str] = {}
+        self._tags: dict[int, AutocompleteIndex] = {}
+
+    @staticmethod
+    def _recency(channel: discord.ForumChannel) -> int:
+        # 스노우플레이크 ID는 시간순이므로 마지막 게시물 ID를 최근 활동 시각으로 사용
+        return channel.last_message_id or channel.id
+
+    def _project_index(self, guild_id: int, status: str) -> AutocompleteIndex:
+        index = self._projects.get((guild_id, status))
+        if index is None:
+            index = self._projects[(guild_id, status)] = AutocompleteIndex()
+        return index
+
+    # --- ProjectRegistry 알림 ---
+    def guild_loaded(self, guild_id: int):
+        for key in [key for key in self._projects if key[0] == guild_id]:
+            del self._projects[key]
+        for key in [key for key in self._project_status if key[0] == guild_id]:
+            del self._project_status[key]
+
+    def project_added(self, guild_id: int, channel: discord.ForumChannel, status: Optional[str]):
+        if status:
+            self._project_index(guild_id, status).add(channel.id, channel.name, self._recency(channel))
+            self._project_status[(guild_id, channel.id)] = status
+        tag_index = self._tags.get(channel.id)
+        if tag_index is not None:
+            self._sync_tags(tag_index, channel)
+
+    def project_updated(self, guild_id: int, channel: discord.ForumChannel, status: Optional[str]):
+        # 이름/상태가 바뀌었을 수 있으므로 이전 상태의 색인에서 빼고 다시 넣음 (태그 색인은 유지하고 동기화)
+        previous = self._project_status.pop((guild_id, channel.id), None)
+        if previous:
+            self._project_index(guild_id, previous).remove(channel.id)
+        self.project_added(guild_id, channel, status)
+
+    def project_removed(self, guild_id: int, channel_id: int):
+        status = self._project_status.pop((guild_id, channel_id), None)
+        if status:
+            self._project_index(guild_id, status).remove(channel_id)
+        self._tags.pop(channel_id, None)
+
+    def project_touched(self, guild_id: int, channel_id: int, recency: int):
+        status = self._project_status.get((guild_id, channel_id))
+        if status:
+            self._project_index(guild_id, status).touch(channel_id, recency)
+
+    # --- 조회 ---
+    def projects(self, guild_id: int, status: str, current: str, limit: int = 25) -> list[str]:
+        with AUTOCOMPLETE_LATENCY.time(kind=f"{status}_projects"):
+            index = self._projects.get((guild_id, status))
+            return index.search(current, limit) if index else []
+
+    def tags(self, forum: discord.ForumChannel, current: str, limit: int = 25) -> list[str]:
+        with AUTOCOMPLETE_LATENCY.time(kind="tags"):
+            index = self._tags.get(forum.id)
+            if index is None:
+                index = self._tags[forum.id] = AutocompleteIndex()
+                self._sync_tags(index, forum)
+            return index.search(current, limit)
+
+    @staticmethod
+    def _sync_tags(index: AutocompleteIndex, forum: discord.ForumChannel):
+        tags = {tag.id: tag.name for tag in forum.available_tags}
+        for tag_id in [tag_id for tag_id in index.keys() if tag_id not in tags]:
+            index.remove(tag_id)
+        for tag_id, name in tags.items():
+            index.add(tag_id, name)
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException
+
+
+async def run_batch(
+    items: list,
+    handler: Callable[[Any], Awaitable[dict]],
+    concurrency: int = 8,
+) -> dict:
+    # 항목별 결과를 입력 순서대로 반환 (한 항목의 실패가 다른 항목을 막지 않음)
+    # 디스코드 라우트 버킷별 순서와 동시 실행은 WriteScheduler가 맡고, 여기서는 한 번에 진행할 항목 수만 제한
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(index: int, item) -> dict:
+        try:
+            async with semaphore:
+                result = await handler(item)
+            return {"index": index, **result}
+        except HTTPException as e:
+            return {"index": index, "status": "error", "status_code": e.status_code, "detail": e.detail}
+        except Exception as e:
+            return {"index": index, "status": "error", "status_code": 500, "detail": str(e)}
+
+    results = await asyncio.gather(*(run_one(index, item) for index, item in enumerate(items)))
+    succeeded = sum(1 for result in results if result.get("status") == "success")
+    return {
+        "status": "success" if succeeded == len(results) else ("partial" if succeeded else "error"),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "results": results,
+    }
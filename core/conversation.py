@@ -0,0 +1,124 @@
+import uuid
+from collections import OrderedDict
+
+from core.streaming import PLACEHOLDER
+
+MODES = ("delta", "budget", "full")
+
+
+class _Session:
+    __slots__ = ("id", "seq", "cursor")
+
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.seq = 0
+        self.cursor = 0  # 마지막으로 보낸 메시지 ID (스풀이 페이로드를 버리면 그 이전으로 되돌림)
+
+
+# 채널/스레드별 대화 세션과 n8n으로 보낼 history 구성
+# - delta(기본): 세션의 첫 페이로드만 최근 기록 전체를 보내고(reset), 이후에는 커서 이후의 새 메시지만 보냄
+# - budget: 최근 메시지부터 중복과 다른 봇의 메시지를 빼고 budget_chars(이름+본문 글자 수)까지 채움
+# - full: 매번 최근 기록 전체를 보냄 (이전 방식)
+# 커서는 페이로드를 스풀에 넣는 시점에 옮김 (스풀이 재시도로 전송을 보장하므로 n8n은 seq 순서대로 받음)
+# 단, n8n이 4xx로 거부해 스풀이 버린 페이로드는 dropped()로 커서를 그 페이로드 이전으로 되돌려 다음 페이로드에 다시 실음
+# 세션은 메모리에만 있으므로 봇이 재시작되면 새 세션 ID로 다시 시작함
+class ConversationSessions:
+    def __init__(self, mode: str = "delta", budget_chars: int = 4000, max_channels: int = 10000):
+        if mode not in MODES:
+            raise ValueError(f"unknown payload mode: {mode}")
+        self.mode = mode
+        self.budget_chars = budget_chars
+        self.max_channels = max_channels
+        self._sessions: OrderedDict[int, _Session] = OrderedDict()
+
+    def _session(self, channel_id: int) -> tuple[_Session, bool]:
+        session = self._sessions.get(channel_id)
+        created = session is None
+        if created:
+            session = self._sessions[channel_id] = _Session()
+            while len(self._sessions) > self.max_channels:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(channel_id)
+        return session, created
+
+    def reset(self, channel_id: int):
+        self._sessions.pop(channel_id, None)
+
+    def build(self, channel_id: int, entries: list[dict], bot_user_id: int) -> tuple[list[dict], dict]:
+        session, created = self._session(channel_id)
+        reset = created or self.mode != "delta"
+        after = session.cursor
+        truncated = False
+
+        if self.mode == "budget":
+            selected = self._pack(entries, bot_user_id)
+        elif reset or self.mode == "full":
+            selected = entries
+        else:
+            selected = [entry for entry in entries if entry["id"] > session.cursor]
+            # 캐시 창보다 많은 메시지가 쌓였으면 그 사이 기록은 빠져 있음
+            truncated = bool(entries) and entries[0]["id"] > session.cursor and len(selected) == len(entries)
+
+        if entries:
+            session.cursor = max(session.cursor, entries[-1]["id"])
+        session.seq += 1
+
+        history = [
+            {
+                "role": "assistant" if entry["author_id"] == bot_user_id else "user",
+                "name": entry["name"],
+                "content": entry["content"],
+            }
+            for entry in selected
+        ]
+        meta = {"id": session.id, "seq": session.seq, "mode": self.mode, "reset": reset}
+        if not reset:
+            meta["after"] = str(after)
+        if truncated:
+            meta["truncated"] = True
+        return history, meta
+
+    def dropped(self, payload: dict):
+        # 스풀이 버린 페이로드의 메시지가 n8n에 가지 않았으므로 커서를 되돌림 (delta 모드만 해당)
+        meta = payload.get("session")
+        if self.mode != "delta" or not meta:
+            return
+        channel_id = int(payload["channelId"])
+        session = self._sessions.get(channel_id)
+        if session is None or session.id != meta["id"]:
+            return
+        if meta["reset"]:
+            # 기준이 되는 전체 기록이 빠졌으므로 새 세션으로 다시 시작
+            self.reset(channel_id)
+        else:
+            session.cursor = min(session.cursor, int(meta["after"]))
+
+    def _pack(self, entries: list[dict], bot_user_id: int) -> list[dict]:
+        # 최신 메시지(방금 받은 메시지)는 항상 포함하고, 나머지는 최신 순으로 예산 안에서 채움
+        packed: list[dict] = []
+        seen: set[tuple[int, str]] = set()
+        used = 0
+        for index, entry in enumerate(reversed(entries)):
+            content = entry["content"].strip()
+            if index > 0:
+                if not content or content == PLACEHOLDER:
+                    continue
+                if entry.get("bot") and entry["author_id"] != bot_user_id:
+                    continue
+            key = (entry["author_id"], content)
+            if key in seen:
+                continue
+            cost = len(entry["name"]) + len(content)
+            if index > 0 and used + cost > self.budget_chars:
+                break
+            if index == 0 and cost > self.budget_chars:
+                entry = {**entry, "content": content[:max(self.budget_chars - len(entry["name"]), 0)]}
+                cost = self.budget_chars
+            seen.add(key)
+            used += cost
+            packed.append(entry)
+        packed.reverse()
+        return packed
+
+    def stats(self) -> dict:
+        return {"sessions": len(self._sessions), "mode": self.mode, "budget_chars": self.budget_chars}
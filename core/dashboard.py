@@ -0,0 +1,137 @@
+import time
+from typing import Callable, Optional
+
+import discord
+
+from core.project_registry import ProjectRegistry
+
+HOW_TO_USE_CHANNEL = "how-to-use"
+STATUS_HEADER = "### 📊 현재 시스템 상태"
+
+
+class GuildDashboard:
+    def __init__(self):
+        self.thread_parent: dict[int, int] = {}
+        self.parent_threads: dict[int, set[int]] = {}
+        self.channel_id: Optional[int] = None
+        self.message_id: Optional[int] = None
+        self.last_body: Optional[str] = None
+        self.synced_at: Optional[int] = None
+        # 상태 메시지를 찾지 못한 횟수와 다음으로 찾아볼 시각 (찾지 못하면 점점 드물게 다시 찾음)
+        self.locate_misses = 0
+        self.locate_after = 0.0
+
+
+# 시스템 상태 대시보드
+# - 프로젝트 수는 ProjectRegistry의 상태별 집합 크기, 이슈 수는 스레드 이벤트로 유지하는 집합 크기로 계산
+# - 렌더링 비용은 프로젝트/스레드 수와 상관없이 일정함
+class Dashboard:
+    def __init__(self, projects: ProjectRegistry, webhook_stats: Callable[[int], dict]):
+        self.projects = projects
+        self.webhook_stats = webhook_stats
+        self._guilds: dict[int, GuildDashboard] = {}
+
+    def guild(self, guild_id: int) -> GuildDashboard:
+        state = self._guilds.get(guild_id)
+        if state is None:
+            state = self._guilds[guild_id] = GuildDashboard()
+        return state
+
+    def guild_ids(self) -> list[int]:
+        return list(self._guilds)
+
+    def load_threads(self, guild: discord.Guild):
+        # 연결 시 한 번만 캐시된 활성 스레드로 초기값을 만들고, 이후에는 이벤트로 갱신
+        state = self.guild(guild.id)
+        state.thread_parent.clear()
+        state.parent_threads.clear()
+        projects = self.projects.guild(guild.id)
+        for thread in guild.threads:
+            if thread.parent_id in projects.by_id and not thread.archived:
+                self.thread_opened(guild.id, thread.id, thread.parent_id)
+
+    # --- ProjectRegistry 알림 ---
+    def guild_loaded(self, guild_id: int):
+        pass
+
+    def project_added(self, guild_id: int, channel: discord.ForumChannel, status: Optional[str]):
+        pass
+
+    def project_updated(self, guild_id: int, channel: discord.ForumChannel, status: Optional[str]):
+        # 이름/태그/카테고리가 바뀌어도 같은 포럼이므로 열린 이슈는 그대로 둠
+        pass
+
+    def project_removed(self, guild_id: int, channel_id: int):
+        state = self._guilds.get(guild_id)
+        if state is None:
+            return
+        for thread_id in state.parent_threads.pop(channel_id, ()):
+            state.thread_parent.pop(thread_id, None)
+
+    # --- 스레드(이슈) 이벤트 ---
+    def thread_opened(self, guild_id: int, thread_id: int, parent_id: int):
+        if parent_id not in self.projects.guild(guild_id).by_id:
+            return
+        state = self.guild(guild_id)
+        state.thread_parent[thread_id] = parent_id
+        state.parent_threads.setdefault(parent_id, set()).add(thread_id)
+
+    def thread_closed(self, guild_id: int, thread_id: int):
+        state = self._guilds.get(guild_id)
+        if state is None:
+            return
+        parent_id = state.thread_parent.pop(thread_id, None)
+        if parent_id is not None:
+            threads = state.parent_threads.get(parent_id)
+            if threads is not None:
+                threads.discard(thread_id)
+                if not threads:
+                    del state.parent_threads[parent_id]
+
+    # --- 렌더링 ---
+    def render_body(self, guild_id: int) -> str:
+        projects = self.projects.guild(guild_id)
+        active = len(projects.by_status["active"])
+        completed = len(projects.by_status["completed"])
+        issues = len(self.guild(guild_id).thread_parent)
+        webhook = self.webhook_stats(guild_id)
+        delivered = webhook.get("delivered", 0)
+        failed = webhook.get("failed", 0) + webhook.get("errors", 0)
+        total = delivered + failed
+        success_rate = f"{delivered / total * 100:.1f}%" if total else "-"
+        return "\n".join([
+            f"- **전체 프로젝트**: {active + completed}개 (진행 중 {active}개 / 완료 {completed}개)",
+            f"- **열려있는 이슈**: {issues}개",
+            f"- **n8n 전송**: 성공 {delivered}건 / 실패 {failed}건 (성공률 {success_rate})",
+        ])
+
+    def render_section(self, guild_id: int) -> Optional[str]:
+        state = self.guild(guild_id)
+        if state.last_body is None:
+            return None
+        synced = f"<t:{state.synced_at}:R>" if state.synced_at else "(봇이 실행되면 표시)"
+        return f"{state.last_body}\n- **마지막 동기화**: {synced}"
+
+    def apply(self, guild_id: int, content: str) -> str:
+        # 본문에서 상태 섹션(헤더 ~ 다음 '---' 줄)을 현재 상태로 교체
+        section = self.render_section(guild_id)
+        lines = content.split("\n")
+        if section is None or STATUS_HEADER not in lines:
+            return content
+        start = lines.index(STATUS_HEADER) + 1
+        if start < len(lines) and lines[start].startswith("("):
+            start += 1
+        end = start
+        while end < len(lines) and lines[end].strip() != "---":
+            end += 1
+        return "\n".join(lines[:start] + section.split("\n") + lines[end:])
+
+    def refresh(self, guild_id: int) -> bool:
+        # 내용이 바뀐 경우에만 True (마지막 동기화 시각은 비교 대상에서 제외)
+        state = self.guild(guild_id)
+        body = self.render_body(guild_id)
+        if body == state.last_body:
+            return False
+        state.last_body = body
+        state.synced_at = int(time.time())
+        return True
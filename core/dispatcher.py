@@ -0,0 +1,286 @@
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Optional
+
+import aiohttp
+import discord
+
+from core.metrics import metrics
+from core.spool import PayloadSpool
+
+# 재시도할 가치가 있는 응답 코드 (그 외 4xx는 영구 실패로 보고 스풀에서 제거)
+RETRYABLE_STATUSES = {404, 408, 429}
+
+ON_MESSAGE_STAGE = metrics.histogram("bot_on_message_stage_seconds", "Latency of each on_message pipeline stage.", ("stage",))
+WEBHOOK_RESULTS = metrics.counter("n8n_webhook_results_total", "n8n webhook deliveries by outcome.", ("outcome",))
+
+
+# 페이로드 전체 대신 요약을 JSON 한 줄로 남기고, sample_rate 비율만 기록
+def log_payload(payload: dict, sample_rate: float):
+    if sample_rate <= 0 or random.random() >= sample_rate:
+        return
+    print(json.dumps({
+        "event": "n8n_payload",
+        "type": payload.get("type"),
+        "channelId": payload.get("channelId"),
+        "userId": payload.get("userId"),
+        "historyLength": len(payload.get("history", [])),
+        "bytes": len(json.dumps(payload, ensure_ascii=False).encode("utf-8")),
+    }, ensure_ascii=False))
+
+
+# n8n 웹훅 전송 파이프라인
+# - on_message는 페이로드를 스풀에 기록만 하고 바로 반환
+# - 드레이너가 스풀을 오래된 순서대로 읽어 전송 (채널 내 순서 유지, 채널 간 병렬)
+# - 실패 시 웹훅 URL별 지수 백오프로 재시도하므로 n8n 장애 중에도 메시지가 유실되지 않음
+# - 백오프 중인 웹훅으로 가는 채널은 조회에서 빼므로, 한 서버의 장애가 다른 서버의 전송을 막지 않음
+class WebhookDispatcher:
+    def __init__(
+        self,
+        url: Optional[str],
+        spool: PayloadSpool,
+        react: Callable[[int, int, str], Awaitable[None]],
+        workers: int = 4,
+        batch_size: int = 200,
+        timeout: float = 30.0,
+        pool_size: int = 20,
+        max_backoff: float = 60.0,
+        compact_interval: float = 300.0,
+        url_for: Optional[Callable[[dict], Optional[str]]] = None,
+        on_drop: Optional[Callable[[dict], None]] = None,
+    ):
+        # url은 기본 웹훅이고, url_for가 페이로드별(서버별) 웹훅을 돌려주면 그쪽으로 전송
+        self.url = url
+        self.url_for = url_for
+        # 재시도하지 않고 버린 페이로드를 알림 (대화 커서 되돌리기)
+        self.on_drop = on_drop
+        self.spool = spool
+        self.react = react
+        self.worker_count = max(1, workers)
+        self.batch_size = batch_size
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.pool_size = pool_size
+        self.max_backoff = max_backoff
+        self.compact_interval = compact_interval
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._drainer: Optional[asyncio.Task] = None
+        self._reactions: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        # 웹훅 URL별 백오프 지연 시간과 다음 시도 시각, 백오프 중인 웹훅으로 가는 채널
+        self._backoff: dict[Optional[str], float] = {}
+        self._retry_at: dict[Optional[str], float] = {}
+        self._paused: dict[int, Optional[str]] = {}
+        self._last_compact = time.monotonic()
+
+        # 통계
+        self.delivered = 0
+        self.failed = 0
+        self.errors = 0
+        self.retries = 0
+        self._guild_counts: dict[Optional[str], dict[str, int]] = {}
+        self.latencies: deque[float] = deque(maxlen=1000)
+
+    async def start(self):
+        await self.spool.open()
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        if self.spool.depth:
+            print(f"[n8n] 스풀에 남아있는 {self.spool.depth}개의 페이로드를 재전송합니다.")
+        self._drainer = asyncio.create_task(self._drain_loop(), name="n8n-drainer")
+
+    async def close(self):
+        if self._drainer is not None:
+            self._drainer.cancel()
+            await asyncio.gather(self._drainer, return_exceptions=True)
+            self._drainer = None
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        await self.spool.close()
+
+    async def submit(self, message: discord.Message, payload: dict):
+        # 디스크에 기록된 뒤 반환하며, 실제 전송은 드레이너가 담당
+        await self.spool.append(message.channel.id, message.id, payload)
+        self._wakeup.set()
+
+    async def _drain_loop(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                wait = await self._drain_once()
+            except Exception as e:
+                print(f"[n8n] 스풀 처리 중 오류: {e}")
+                wait = 1.0
+
+            if wait is None or wait > 0:
+                # 새 페이로드가 들어오면 (다른 웹훅으로 갈 수 있으므로) 기다리지 않고 바로 다시 확인
+                timeout = self.compact_interval if wait is None else wait * random.uniform(0.5, 1.0)
+                # wait_for는 깨어나는 순간 취소되면 취소를 삼킬 수 있으므로 (close가 멈춤) timeout 블록을 씀
+                try:
+                    async with asyncio.timeout(timeout):
+                        await self._wakeup.wait()
+                except TimeoutError:
+                    pass
+
+            if time.monotonic() - self._last_compact >= self.compact_interval:
+                self._last_compact = time.monotonic()
+                try:
+                    await self.spool.compact()
+                except Exception as e:
+                    print(f"[n8n] 스풀 정리 중 오류: {e}")
+
+    def _url_of(self, row: dict) -> Optional[str]:
+        return (self.url_for(row["payload"]) if self.url_for else None) or self.url
+
+    def _resume_due(self, now: float):
+        # 백오프가 끝난 웹훅의 채널을 다시 전송 대상으로 돌려놓음 (지연 시간은 성공할 때까지 유지)
+        for url, until in list(self._retry_at.items()):
+            if until <= now:
+                del self._retry_at[url]
+        for channel_id, url in list(self._paused.items()):
+            if url not in self._retry_at:
+                del self._paused[channel_id]
+
+    async def _drain_once(self) -> Optional[float]:
+        # 다음 시도까지 기다릴 시간을 반환 (0: 바로 다시, None: 새 페이로드가 들어올 때까지)
+        self._resume_due(time.monotonic())
+        rows = await self.spool.peek(self.batch_size, exclude_channels=self._paused)
+        if not rows:
+            if not self._retry_at:
+                return None
+            return max(0.0, min(self._retry_at.values()) - time.monotonic())
+
+        # 같은 채널의 대화는 순서대로, 다른 채널끼리는 병렬로 전송
+        by_channel: dict[int, list[dict]] = defaultdict(list)
+        for row in rows:
+            by_channel[row["channel_id"]].append(row)
+
+        # 백오프 중인 웹훅으로 가는 채널은 멈춰두고, 다음 조회부터 빼서 다른 서버의 전송을 막지 않게 함
+        ready = []
+        for channel_id, items in by_channel.items():
+            url = self._url_of(items[0])
+            if url in self._retry_at:
+                self._paused[channel_id] = url
+            else:
+                ready.append((url, items))
+        if not ready:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.worker_count)
+        await asyncio.gather(*(self._drain_channel(url, items, semaphore) for url, items in ready))
+        return 0
+
+    async def _drain_channel(self, url: Optional[str], rows: list[dict], semaphore: asyncio.Semaphore):
+        done = []
+        async with semaphore:
+            for row in rows:
+                # 같은 웹훅으로 가는 다른 채널이 방금 실패했으면 이 채널도 멈춤
+                if url in self._retry_at:
+                    self._paused[row["channel_id"]] = url
+                    break
+                outcome = await self._deliver(row, url)
+                if outcome == "retry":
+                    await self.spool.mark_attempt([row["id"]])
+                    self._paused[row["channel_id"]] = url
+                    self._increase_backoff(url)
+                    break
+                done.append(row["id"])
+                self._backoff.pop(url, None)
+        await self.spool.ack(done)
+
+    async def _deliver(self, row: dict, url: Optional[str]) -> str:
+        started = time.perf_counter()
+        reaction = None
+        outcome = "retry"
+        status = None
+        try:
+            if not url:
+                raise ValueError("no n8n webhook URL configured")
+            async with self.session.post(url, json=row["payload"]) as response:
+                status = response.status
+                if status == 200:
+                    outcome, reaction = "ok", "✅"
+                    self.delivered += 1
+                    self._count(row, "delivered")
+                elif status in RETRYABLE_STATUSES or status >= 500:
+                    self.retries += 1
+                else:
+                    outcome, reaction = "dropped", "❌"
+                    self.failed += 1
+                    self._count(row, "failed")
+                    print(f"n8n webhook returned status: {status}")
+                    if self.on_drop is not None:
+                        self.on_drop(row["payload"])
+        except Exception as e:
+            self.errors += 1
+            self._count(row, "errors")
+            print(f"Error sending to n8n: {e}")
+
+        latency = time.perf_counter() - started
+        self.latencies.append(latency)
+        ON_MESSAGE_STAGE.observe(latency, stage="webhook_post")
+        WEBHOOK_RESULTS.inc(outcome=outcome)
+        if outcome != "ok":
+            print(
+                f"[n8n] id={row['id']} status={status} latency={latency * 1000:.1f}ms "
+                f"attempts={row['attempts'] + 1} depth={self.spool.depth}"
+            )
+
+        # 첫 실패 시에는 🔥로 지연을 알리고, 이후 전송이 성공하면 ✅를 추가
+        if outcome == "retry" and row["attempts"] == 0:
+            reaction = "🔥"
+        if reaction:
+            # 리액션은 레이트 리밋이 엄격하므로 재전송 속도를 막지 않도록 따로 처리
+            task = asyncio.create_task(self._react(row["channel_id"], row["message_id"], reaction))
+            self._reactions.add(task)
+            task.add_done_callback(self._reactions.discard)
+        return outcome
+
+    async def _react(self, channel_id: int, message_id: int, reaction: str):
+        try:
+            with ON_MESSAGE_STAGE.time(stage="reaction"):
+                await self.react(channel_id, message_id, reaction)
+        except discord.HTTPException as e:
+            print(f"[n8n] 리액션 추가 실패: {e}")
+
+    def _increase_backoff(self, url: Optional[str]):
+        # 백오프는 웹훅 URL별로 유지 (한 서버의 웹훅 장애가 다른 서버의 전송을 늦추지 않음)
+        # 같은 웹훅으로 가는 여러 채널이 한 번에 실패해도 지연 시간은 한 번만 늘림
+        if url in self._retry_at:
+            return
+        delay = min(self.max_backoff, max(1.0, self._backoff.get(url, 0.0) * 2))
+        self._backoff[url] = delay
+        self._retry_at[url] = time.monotonic() + delay
+
+    def _count(self, row: dict, key: str):
+        counts = self._guild_counts.setdefault(row["payload"].get("guildId"), {"delivered": 0, "failed": 0, "errors": 0})
+        counts[key] += 1
+
+    def guild_stats(self, guild_id: int) -> dict:
+        # 대시보드용 서버별 전송 결과 (페이로드의 guildId 기준)
+        return dict(self._guild_counts.get(str(guild_id), {"delivered": 0, "failed": 0, "errors": 0}))
+
+    def stats(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not ordered:
+                return None
+            return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+        return {
+            "queue_depth": self.spool.depth,
+            "workers": self.worker_count,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "errors": self.errors,
+            "retries": self.retries,
+            "backoff": max(self._backoff.values(), default=0.0),
+            "backoff_webhooks": len(self._retry_at),
+            "latency_p50": percentile(0.50),
+            "latency_p99": percentile(0.99),
+        }
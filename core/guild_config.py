@@ -0,0 +1,91 @@
+import asyncio
+import sqlite3
+import time
+from typing import Optional
+
+from core.project_registry import ACTIVE_CATEGORY, COMPLETED_CATEGORY
+
+FIELDS = ("active_category", "completed_category", "webhook_url")
+
+
+# 서버별 설정. 값이 없으면 기본 카테고리 이름과 기본 n8n 웹훅(N8N_WEBHOOK_URL)을 사용
+class GuildConfig:
+    def __init__(self, active_category: Optional[str] = None, completed_category: Optional[str] = None, webhook_url: Optional[str] = None):
+        self.active_category = active_category or ACTIVE_CATEGORY
+        self.completed_category = completed_category or COMPLETED_CATEGORY
+        self.webhook_url = webhook_url or None
+
+    @property
+    def categories(self) -> dict[str, str]:
+        return {"active": self.active_category, "completed": self.completed_category}
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in FIELDS}
+
+
+DEFAULT_CONFIG = GuildConfig()
+
+
+# 서버별 설정 저장소 (SQLite). 읽기는 메모리에서 바로 하고, 변경만 디스크에 기록
+class GuildConfigStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._configs: dict[int, GuildConfig] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def open(self):
+        async with self._lock:
+            if self._conn is None:
+                self._conn = await asyncio.to_thread(self._open)
+                rows = await asyncio.to_thread(self._load)
+                self._configs = {guild_id: GuildConfig(*values) for guild_id, *values in rows}
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS guild_config ("
+            " guild_id INTEGER PRIMARY KEY,"
+            " active_category TEXT,"
+            " completed_category TEXT,"
+            " webhook_url TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        return conn
+
+    def _load(self) -> list[tuple]:
+        return self._conn.execute("SELECT guild_id, active_category, completed_category, webhook_url FROM guild_config").fetchall()
+
+    async def close(self):
+        async with self._lock:
+            if self._conn is not None:
+                await asyncio.to_thread(self._conn.close)
+                self._conn = None
+
+    def get(self, guild_id: Optional[int]) -> GuildConfig:
+        if guild_id is None:
+            return DEFAULT_CONFIG
+        return self._configs.get(guild_id, DEFAULT_CONFIG)
+
+    def category_names(self, guild_id: int) -> dict[str, str]:
+        return self.get(guild_id).categories
+
+    async def update(self, guild_id: int, **fields) -> GuildConfig:
+        # None이 아닌 값만 바꾸고, 빈 문자열은 기본값으로 되돌림
+        values = self.get(guild_id).to_dict()
+        for field, value in fields.items():
+            if field not in FIELDS:
+                raise KeyError(field)
+            if value is not None:
+                values[field] = value
+        config = GuildConfig(**values)
+        row = (guild_id, config.active_category, config.completed_category, config.webhook_url, time.time())
+        async with self._lock:
+            await asyncio.to_thread(
+                self._conn.execute,
+                "INSERT OR REPLACE INTO guild_config (guild_id, active_category, completed_category, webhook_url, updated_at) VALUES (?, ?, ?, ?, ?)",
+                row,
+            )
+        self._configs[guild_id] = config
+        return config
@@ -0,0 +1,110 @@
+import asyncio
+from collections import OrderedDict, deque
+
+import discord
+
+
+# 채널/스레드별 최근 대화 링 버퍼
+# - 게이트웨이 이벤트(on_message, 수정, 삭제)로 채워지고, 처음 조회될 때만 REST로 history를 읽음
+# - max_channels를 넘으면 가장 오래 사용하지 않은 채널부터 제거 (LRU)
+class HistoryCache:
+    def __init__(self, depth: int = 20, max_channels: int = 1000):
+        self.depth = depth
+        self.max_channels = max_channels
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._channels: OrderedDict[int, deque] = OrderedDict()
+        # 콜드 로딩 중인 채널: (로딩 태스크, 로딩 중 도착한 메시지 버퍼)
+        self._loading: dict[int, tuple[asyncio.Task, list[dict]]] = {}
+
+    @staticmethod
+    def _entry(message: discord.Message) -> dict:
+        return {
+            "id": message.id,
+            "author_id": message.author.id,
+            "bot": message.author.bot,
+            "name": message.author.display_name.replace('"', "'"),
+            "content": message.content,
+        }
+
+    def record(self, message: discord.Message):
+        channel_id = message.channel.id
+        buffer = self._channels.get(channel_id)
+        if buffer is not None:
+            if not buffer or buffer[-1]["id"] < message.id:
+                buffer.append(self._entry(message))
+            self._channels.move_to_end(channel_id)
+        elif channel_id in self._loading:
+            self._loading[channel_id][1].append(self._entry(message))
+        # 아직 캐시되지 않은 채널은 다음 조회 때 REST로 한 번에 채움
+
+    def update(self, channel_id: int, message_id: int, content: str):
+        for entry in self._channels.get(channel_id, ()):
+            if entry["id"] == message_id:
+                entry["content"] = content
+                return
+
+    def remove(self, channel_id: int, message_ids: set[int]):
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            return
+        kept = [entry for entry in buffer if entry["id"] not in message_ids]
+        if len(kept) != len(buffer):
+            # 삭제로 비는 자리는 REST 없이 채울 수 없으므로 다음 조회 때 다시 로드
+            if len(buffer) == buffer.maxlen:
+                del self._channels[channel_id]
+            else:
+                self._channels[channel_id] = deque(kept, maxlen=self.depth)
+
+    def drop(self, channel_id: int):
+        self._channels.pop(channel_id, None)
+
+    async def get(self, channel: discord.abc.Messageable) -> list[dict]:
+        channel_id = channel.id
+        buffer = self._channels.get(channel_id)
+        if buffer is not None:
+            self.hits += 1
+            self._channels.move_to_end(channel_id)
+            return list(buffer)
+
+        self.misses += 1
+        loading = self._loading.get(channel_id)
+        if loading is None:
+            task = asyncio.create_task(self._load(channel))
+            loading = (task, [])
+            self._loading[channel_id] = loading
+        try:
+            return list(await asyncio.shield(loading[0]))
+        finally:
+            if self._loading.get(channel_id) is loading and loading[0].done():
+                del self._loading[channel_id]
+
+    async def _load(self, channel: discord.abc.Messageable) -> deque:
+        fetched = [self._entry(message) async for message in channel.history(limit=self.depth)]
+        fetched.reverse()
+        buffer = deque(fetched, maxlen=self.depth)
+
+        # 로딩 중에 도착한 메시지 합치기
+        last_id = buffer[-1]["id"] if buffer else 0
+        for entry in self._loading.get(channel.id, (None, []))[1]:
+            if entry["id"] > last_id:
+                buffer.append(entry)
+                last_id = entry["id"]
+
+        self._channels[channel.id] = buffer
+        self._channels.move_to_end(channel.id)
+        while len(self._channels) > self.max_channels:
+            self._channels.popitem(last=False)
+            self.evictions += 1
+        return buffer
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "channels": len(self._channels),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else None,
+        }
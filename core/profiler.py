@@ -0,0 +1,38 @@
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+
+
+def _collapse(frame) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+# 이벤트 루프 스레드의 스택을 일정 간격으로 샘플링해 flamegraph용 collapsed 형식으로 반환
+async def profile_event_loop(seconds: float, interval: float = 0.005) -> str:
+    target = threading.get_ident()
+    samples: Counter[str] = Counter()
+    stop = threading.Event()
+
+    def sampler():
+        while not stop.is_set():
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                samples[_collapse(frame)] += 1
+            time.sleep(interval)
+
+    thread = threading.Thread(target=sampler, name="event-loop-profiler", daemon=True)
+    thread.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        stop.set()
+        await asyncio.to_thread(thread.join)
+
+    return "\n".join(f"{stack} {count}" for stack, count in samples.most_common()) + "\n"
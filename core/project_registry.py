@@ -0,0 +1,152 @@
+from typing import Callable, Optional
+
+import discord
+
+ACTIVE_CATEGORY = "Active Projects"
+COMPLETED_CATEGORY = "Completed Projects"
+STATUS_CATEGORIES = {"active": ACTIVE_CATEGORY, "completed": COMPLETED_CATEGORY}
+
+
+# 한 서버의 프로젝트(포럼 채널) 색인
+class GuildProjects:
+    def __init__(self, guild_id: int, listeners: Optional[list] = None, category_names: Optional[dict[str, str]] = None):
+        self.guild_id = guild_id
+        self.listeners = listeners if listeners is not None else []
+        # 상태별 카테고리 이름 (서버 설정으로 바꿀 수 있음)
+        self.category_names = category_names or STATUS_CATEGORIES
+        self.categories: dict[str, discord.CategoryChannel] = {}
+        self.by_id: dict[int, discord.ForumChannel] = {}
+        self.by_name: dict[str, set[int]] = {}
+        self.by_status: dict[str, set[int]] = {status: set() for status in STATUS_CATEGORIES}
+        self._name_of: dict[int, str] = {}
+        self._status_of: dict[int, Optional[str]] = {}
+
+    def status_of(self, channel: discord.ForumChannel) -> Optional[str]:
+        category = channel.category
+        if category is None:
+            return None
+        for status, category_name in self.category_names.items():
+            if category.name == category_name:
+                return status
+        return None
+
+    def add(self, channel: discord.ForumChannel):
+        # discord.py는 채널 객체를 제자리에서 갱신하므로, 이전 이름/상태는 따로 기억해 둠
+        # 이미 있는 프로젝트면 (이름/태그/카테고리 변경) 제거 없이 project_updated로 알림
+        updated = self._unindex(channel.id)
+        status = self.status_of(channel)
+        self.by_id[channel.id] = channel
+        self.by_name.setdefault(channel.name, set()).add(channel.id)
+        self._name_of[channel.id] = channel.name
+        self._status_of[channel.id] = status
+        if status:
+            self.by_status[status].add(channel.id)
+        for listener in self.listeners:
+            if updated:
+                listener.project_updated(self.guild_id, channel, status)
+            else:
+                listener.project_added(self.guild_id, channel, status)
+
+    def remove(self, channel_id: int):
+        if not self._unindex(channel_id):
+            return
+        for listener in self.listeners:
+            listener.project_removed(self.guild_id, channel_id)
+
+    def _unindex(self, channel_id: int) -> bool:
+        if self.by_id.pop(channel_id, None) is None:
+            return False
+        name = self._name_of.pop(channel_id)
+        channel_ids = self.by_name[name]
+        channel_ids.discard(channel_id)
+        if not channel_ids:
+            del self.by_name[name]
+        status = self._status_of.pop(channel_id)
+        if status:
+            self.by_status[status].discard(channel_id)
+        return True
+
+    def add_category(self, category: discord.CategoryChannel):
+        self.remove_category(category.id)
+        self.categories[category.name] = category
+        # 카테고리 이름이 바뀌면 하위 프로젝트의 상태도 바뀔 수 있음
+        for channel in category.forums:
+            self.add(channel)
+
+    def remove_category(self, category_id: int):
+        for name, category in list(self.categories.items()):
+            if category.id == category_id:
+                del self.categories[name]
+
+    def get(self, channel_id: int) -> Optional[discord.ForumChannel]:
+        return self.by_id.get(channel_id)
+
+    def find(self, name: str, status: Optional[str] = None) -> list[discord.ForumChannel]:
+        channels = [self.by_id[channel_id] for channel_id in self.by_name.get(name, ())]
+        if status is not None:
+            channels = [channel for channel in channels if channel.id in self.by_status[status]]
+        return channels
+
+    def projects(self, status: str) -> list[discord.ForumChannel]:
+        channels = [self.by_id[channel_id] for channel_id in self.by_status.get(status, ())]
+        channels.sort(key=lambda channel: channel.position)
+        return channels
+
+    def category_for(self, status: str) -> Optional[discord.CategoryChannel]:
+        return self.categories.get(self.category_names[status])
+
+
+# 게이트웨이 채널 이벤트로 유지되는 서버별 프로젝트 색인
+# 리스너(project_added/project_updated/project_removed/guild_loaded)로 다른 색인에 변경을 전달
+class ProjectRegistry:
+    def __init__(self, category_names: Optional[Callable[[int], dict[str, str]]] = None):
+        self._guilds: dict[int, GuildProjects] = {}
+        self.listeners: list = []
+        self.category_names = category_names or (lambda guild_id: STATUS_CATEGORIES)
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def __contains__(self, guild_id: int) -> bool:
+        return guild_id in self._guilds
+
+    def guild(self, guild_id: int) -> GuildProjects:
+        projects = self._guilds.get(guild_id)
+        if projects is None:
+            projects = self._guilds[guild_id] = GuildProjects(guild_id, self.listeners, self.category_names(guild_id))
+        return projects
+
+    def load_guild(self, guild: discord.Guild):
+        # 서버 전체를 한 번만 훑어 색인을 새로 만듦 (연결/재연결 시)
+        for listener in self.listeners:
+            listener.guild_loaded(guild.id)
+        projects = GuildProjects(guild.id, self.listeners, self.category_names(guild.id))
+        for category in guild.categories:
+            projects.categories.setdefault(category.name, category)
+        for channel in guild.forums:
+            projects.add(channel)
+        self._guilds[guild.id] = projects
+
+    def unload_guild(self, guild_id: int):
+        self._guilds.pop(guild_id, None)
+        for listener in self.listeners:
+            listener.guild_loaded(guild_id)
+
+    def on_channel_create(self, channel: discord.abc.GuildChannel):
+        projects = self.guild(channel.guild.id)
+        if isinstance(channel, discord.ForumChannel):
+            projects.add(channel)
+        elif isinstance(channel, discord.CategoryChannel):
+            projects.add_category(channel)
+
+    def on_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        self.on_channel_create(after)
+
+    def on_channel_delete(self, channel: discord.abc.GuildChannel):
+        projects = self.guild(channel.guild.id)
+        if isinstance(channel, discord.ForumChannel):
+            projects.remove(channel.id)
+        elif isinstance(channel, discord.CategoryChannel):
+            projects.remove_category(channel.id)
+            for forum in channel.forums:
+                projects.add(forum)
@@ -0,0 +1,329 @@
+import asyncio
+import datetime
+import glob
+import gzip
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Optional
+
+from core.metrics import metrics
+
+SEARCH_LATENCY = metrics.histogram("search_query_seconds", "Latency of full-text searches over archived messages.")
+
+# trigram 토크나이저는 3글자 미만 검색어를 색인으로 찾지 못하므로 2글자 단어(서버, 오류, 배포 등)는 bigram 색인으로 찾고,
+# 1글자 단어만 LIKE로 거름
+MIN_TRIGRAM = 3
+MIN_BIGRAM = 2
+WORD = re.compile(r"\w+")
+
+
+def _timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def _isoformat(value: Optional[float]) -> Optional[str]:
+    if value is None:
+        return None
+    return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).isoformat()
+
+
+def _utc_timestamp(value: Optional[datetime.datetime]) -> Optional[float]:
+    # 시간대가 없는 값은 UTC로 해석
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _bigrams(text: str) -> str:
+    # 단어마다 겹치는 2글자 조각으로 나눔 ("서버가 죽음" → "서버 버가 죽음"), 2글자 이하 단어는 그대로
+    grams = []
+    for word in WORD.findall(text.lower()):
+        if len(word) <= MIN_BIGRAM:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + MIN_BIGRAM] for i in range(len(word) - 1))
+    return " ".join(grams)
+
+
+def _snippet(content: str, terms: list[str], width: int = 120) -> str:
+    # bigram 색인은 원문을 갖고 있지 않으므로 FTS snippet()과 같은 모양으로 직접 만듦
+    lowered = content.lower()
+    hits = [hit for hit in (lowered.find(term.lower()) for term in terms) if hit >= 0]
+    start = max(0, min(hits, default=0) - width // 4)
+    end = start + width
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    text = pattern.sub(lambda match: f"**{match.group(0)}**", content[start:end])
+    return ("…" if start else "") + text + ("…" if end < len(content) else "")
+
+
+# 보관된 프로젝트/스레드 메시지의 전문 검색 색인 (SQLite FTS5, trigram + 2글자 단어용 bigram)
+# - Archiver의 리스너로 스윕 결과와 실시간 메시지/수정/삭제를 그대로 반영
+# - 쓰기와 검색은 연결을 따로 써서, 스윕 중에도 검색이 기다리지 않음
+class SearchIndex:
+    def __init__(self, path: str):
+        self.path = path
+        self._writer: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._read_lock = asyncio.Lock()
+        self.documents = 0
+
+    async def open(self):
+        self._writer = await asyncio.to_thread(self._open)
+        self._reader = await asyncio.to_thread(sqlite3.connect, self.path, check_same_thread=False)
+        self.documents = await asyncio.to_thread(self._count)
+
+    def _open(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        has_bigram = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'messages_bigram'").fetchone() is not None
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY,
+                guild_id INTEGER NOT NULL,
+                project_id INTEGER NOT NULL,
+                project TEXT NOT NULL,
+                thread_id INTEGER NOT NULL,
+                thread TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                author TEXT NOT NULL,
+                bot INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                content TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS messages_thread ON messages (thread_id, created_at);
+            CREATE INDEX IF NOT EXISTS messages_project ON messages (guild_id, project_id, created_at);
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                content, thread, project, content='messages', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+                INSERT INTO messages_fts (rowid, content, thread, project) VALUES (new.id, new.content, new.thread, new.project);
+            END;
+            CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+                INSERT INTO messages_fts (messages_fts, rowid, content, thread, project) VALUES ('delete', old.id, old.content, old.thread, old.project);
+            END;
+            CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages BEGIN
+                INSERT INTO messages_fts (messages_fts, rowid, content, thread, project) VALUES ('delete', old.id, old.content, old.thread, old.project);
+                INSERT INTO messages_fts (rowid, content, thread, project) VALUES (new.id, new.content, new.thread, new.project);
+            END;
+            -- 2글자 조각을 공백으로 이어 넣는 색인 (조각은 파이썬에서 만들어 _apply가 직접 갱신)
+            CREATE VIRTUAL TABLE IF NOT EXISTS messages_bigram USING fts5(
+                content, thread, project, content='', tokenize='unicode61'
+            );
+            """
+        )
+        if not has_bigram:
+            # bigram 색인이 없던 예전 색인 파일은 한 번 채움
+            conn.create_function("bigrams", 1, _bigrams, deterministic=True)
+            conn.execute(
+                "INSERT INTO messages_bigram (rowid, content, thread, project)"
+                " SELECT id, bigrams(content), bigrams(thread), bigrams(project) FROM messages"
+            )
+        return conn
+
+    def _count(self) -> int:
+        return self._writer.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    async def close(self):
+        async with self._write_lock, self._read_lock:
+            for conn in (self._writer, self._reader):
+                if conn is not None:
+                    await asyncio.to_thread(conn.close)
+            self._writer = self._reader = None
+
+    # --- 색인 갱신 (Archiver 리스너) ---
+    async def archived(self, records: list[dict]):
+        async with self._write_lock:
+            self.documents += await asyncio.to_thread(self._apply, records)
+
+    def _apply(self, records: list[dict]) -> int:
+        # 배치 하나를 한 트랜잭션으로 반영하고, 늘어난 문서 수를 반환
+        added = 0
+        self._writer.execute("BEGIN")
+        try:
+            for record in records:
+                event = record["event"]
+                if event == "message":
+                    cursor = self._writer.execute(
+                        "INSERT OR IGNORE INTO messages (id, guild_id, project_id, project, thread_id, thread, tags, author, bot, created_at, content)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            record["id"], record["guild_id"], record["project_id"], record["project"],
+                            record["thread_id"], record["thread"], json.dumps(record["tags"], ensure_ascii=False),
+                            record["author"], int(record["bot"]), _timestamp(record["created_at"]), record["content"],
+                        ),
+                    )
+                    if cursor.rowcount:
+                        self._index_bigrams(record["id"], record["content"], record["thread"], record["project"])
+                    added += cursor.rowcount
+                elif event == "edit":
+                    if self._unindex_bigrams(record["id"]):
+                        self._writer.execute("UPDATE messages SET content = ? WHERE id = ?", (record["content"], record["id"]))
+                        thread, project = self._writer.execute("SELECT thread, project FROM messages WHERE id = ?", (record["id"],)).fetchone()
+                        self._index_bigrams(record["id"], record["content"], thread, project)
+                elif event == "delete":
+                    self._unindex_bigrams(record["id"])
+                    added -= self._writer.execute("DELETE FROM messages WHERE id = ?", (record["id"],)).rowcount
+            self._writer.execute("COMMIT")
+        except Exception:
+            self._writer.execute("ROLLBACK")
+            raise
+        return added
+
+    def _index_bigrams(self, message_id: int, content: str, thread: str, project: str):
+        self._writer.execute(
+            "INSERT INTO messages_bigram (rowid, content, thread, project) VALUES (?, ?, ?, ?)",
+            (message_id, _bigrams(content), _bigrams(thread), _bigrams(project)),
+        )
+
+    def _unindex_bigrams(self, message_id: int) -> bool:
+        # 원문이 없는(contentless) 색인이라 지울 때 넣었던 값을 그대로 다시 줘야 함
+        row = self._writer.execute("SELECT content, thread, project FROM messages WHERE id = ?", (message_id,)).fetchone()
+        if row is None:
+            return False
+        self._writer.execute(
+            "INSERT INTO messages_bigram (messages_bigram, rowid, content, thread, project) VALUES ('delete', ?, ?, ?, ?)",
+            (message_id, *(_bigrams(value) for value in row)),
+        )
+        return True
+
+    async def load_archive(self, root: str, batch_size: int = 500) -> int:
+        # 색인이 비어있을 때 이미 보관된 gzip JSONL로 채움 (파일을 한 줄씩 읽으므로 메모리는 일정)
+        loaded = 0
+        for path in sorted(glob.glob(os.path.join(root, "*", "*", "*.jsonl.gz"))):
+            async with self._write_lock:
+                count, added = await asyncio.to_thread(self._load_file, path, batch_size)
+            loaded += count
+            self.documents += added
+        return loaded
+
+    def _load_file(self, path: str, batch_size: int) -> tuple[int, int]:
+        count = added = 0
+        batch = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                batch.append(json.loads(line))
+                if len(batch) >= batch_size:
+                    added += self._apply(batch)
+                    count += len(batch)
+                    batch = []
+        if batch:
+            added += self._apply(batch)
+            count += len(batch)
+        return count, added
+
+    # --- 검색 ---
+    async def search(
+        self,
+        query: str,
+        guild_id: Optional[int] = None,
+        project: Optional[str] = None,
+        project_id: Optional[int] = None,
+        thread_id: Optional[int] = None,
+        tag: Optional[str] = None,
+        after: Optional[datetime.datetime] = None,
+        before: Optional[datetime.datetime] = None,
+        include_bots: bool = True,
+        limit: int = 10,
+    ) -> list[dict]:
+        terms = query.split()
+        long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM]
+        # 단어 문자로만 된 2글자 검색어는 bigram 색인의 조각 하나와 그대로 일치
+        bigram_terms = [term for term in terms if len(term) == MIN_BIGRAM and _bigrams(term) == term.lower()]
+        short_terms = [term for term in terms if len(term) < MIN_TRIGRAM and term not in bigram_terms]
+
+        joins, scores, where, params = [], [], [], []
+        if long_terms:
+            # 본문 일치를 스레드/프로젝트 이름 일치보다 높게 평가 (bm25는 낮을수록 관련도가 높으므로 부호를 바꿈)
+            joins.append("JOIN messages_fts ON messages_fts.rowid = m.id")
+            scores.append("-bm25(messages_fts, 1.0, 0.5, 0.3)")
+            where.append("messages_fts MATCH ?")
+            params.append(" ".join(_fts_phrase(term) for term in long_terms))
+        if bigram_terms:
+            joins.append("JOIN messages_bigram ON messages_bigram.rowid = m.id")
+            scores.append("-bm25(messages_bigram, 1.0, 0.5, 0.3)")
+            where.append("messages_bigram MATCH ?")
+            params.append(" ".join(_fts_phrase(term.lower()) for term in bigram_terms))
+        for term in short_terms:
+            where.append("m.content LIKE ? ESCAPE '\\'")
+            params.append(_like_pattern(term))
+        filters = {
+            "m.guild_id = ?": guild_id,
+            "m.project = ?": project,
+            "m.project_id = ?": project_id,
+            "m.thread_id = ?": thread_id,
+            "EXISTS (SELECT 1 FROM json_each(m.tags) WHERE value = ?)": tag,
+            "m.created_at >= ?": _utc_timestamp(after),
+            "m.created_at < ?": _utc_timestamp(before),
+        }
+        for clause, value in filters.items():
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        if not include_bots:
+            where.append("m.bot = 0")
+
+        if scores:
+            # 두 색인에 모두 걸리면 점수를 더함 (bigram 색인은 원문이 없으므로 스니펫은 본문에서 만듦)
+            snippet = "snippet(messages_fts, 0, '**', '**', '…', 24)" if long_terms else "m.content"
+            sql = (
+                "SELECT m.id, m.guild_id, m.project_id, m.project, m.thread_id, m.thread, m.tags, m.author, m.created_at,"
+                f" {snippet}, {' + '.join(scores)} AS score"
+                f" FROM messages m {' '.join(joins)}"
+                f" WHERE {' AND '.join(where)} ORDER BY score DESC LIMIT ?"
+            )
+        else:
+            # 1글자 검색어만 있으면 색인을 쓸 수 없으므로 최신 메시지부터 LIKE로 찾음
+            sql = (
+                "SELECT m.id, m.guild_id, m.project_id, m.project, m.thread_id, m.thread, m.tags, m.author, m.created_at,"
+                " substr(m.content, 1, 200), NULL AS score"
+                " FROM messages m"
+                f" WHERE {' AND '.join(where) or '1'} ORDER BY m.created_at DESC LIMIT ?"
+            )
+        params.append(limit)
+
+        started = time.perf_counter()
+        async with self._read_lock:
+            rows = await asyncio.to_thread(self._query, sql, params)
+        SEARCH_LATENCY.observe(time.perf_counter() - started)
+        return [
+            {
+                "id": row[0],
+                "guild_id": row[1],
+                "project_id": row[2],
+                "project": row[3],
+                "thread_id": row[4],
+                "thread": row[5],
+                "tags": json.loads(row[6]),
+                "author": row[7],
+                "created_at": _isoformat(row[8]),
+                "snippet": row[9] if long_terms or not bigram_terms else _snippet(row[9], bigram_terms + short_terms),
+                "score": row[10],
+                "jump_url": f"https://discord.com/channels/{row[1]}/{row[4]}/{row[0]}",
+            }
+            for row in rows
+        ]
+
+    def _query(self, sql: str, params: list) -> list[tuple]:
+        return self._reader.execute(sql, params).fetchall()
+
+    def stats(self) -> dict:
+        return {"documents": self.documents}
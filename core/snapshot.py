@@ -0,0 +1,95 @@
+import asyncio
+import uuid
+from typing import Optional
+
+from core.project_registry import STATUS_CATEGORIES, ProjectRegistry
+
+
+# 분리 모드에서 API 워커가 읽을 프로젝트 목록 스냅샷 (게이트웨이 쪽)
+# - 프로젝트 색인 리스너로 서버별 버전만 올려두고, 내용은 요청 시 색인에서 만듦
+# - 워커는 마지막으로 받은 버전을 보내 그 이후 바뀐 서버만 받아감 (long-poll)
+class ProjectSnapshot:
+    def __init__(self, projects: ProjectRegistry):
+        self.projects = projects
+        # 게이트웨이가 재시작되면 버전이 처음부터 다시 시작하므로, 다른 epoch의 워커에는 전체를 보냄
+        self.epoch = uuid.uuid4().hex
+        self.version = 0
+        self._versions: dict[int, int] = {}
+        self._changed = asyncio.Event()
+        self._waiters = 0
+
+    # --- 프로젝트 색인 리스너 ---
+    def guild_loaded(self, guild_id: int):
+        self._touch(guild_id)
+
+    def project_added(self, guild_id: int, channel, status: Optional[str]):
+        self._touch(guild_id)
+
+    def project_updated(self, guild_id: int, channel, status: Optional[str]):
+        self._touch(guild_id)
+
+    def project_removed(self, guild_id: int, channel_id: int):
+        self._touch(guild_id)
+
+    def _touch(self, guild_id: int):
+        self.version += 1
+        self._versions[guild_id] = self.version
+        if self._waiters:
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    # --- 복제 ---
+    async def wait(self, epoch: Optional[str], since: int, timeout: float):
+        if epoch != self.epoch or self.version > since:
+            return
+        self._waiters += 1
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiters -= 1
+
+    def delta(self, epoch: Optional[str], since: int) -> dict:
+        # 내보낸 뒤 색인에서 빠진 서버는 None으로 전달
+        full = epoch != self.epoch
+        if full:
+            since = 0
+        guilds = {}
+        for guild_id, version in self._versions.items():
+            if version <= since:
+                continue
+            if guild_id not in self.projects:
+                guilds[str(guild_id)] = None
+                continue
+            projects = self.projects.guild(guild_id)
+            guilds[str(guild_id)] = {
+                status: [[channel.id, channel.name] for channel in projects.projects(status)]
+                for status in STATUS_CATEGORIES
+            }
+        return {"epoch": self.epoch, "full": full, "version": self.version, "guilds": guilds}
+
+
+# API 워커 쪽 복제본
+class SnapshotReplica:
+    def __init__(self):
+        self.epoch: Optional[str] = None
+        self.version = 0
+        self.guilds: dict[int, dict[str, list]] = {}
+
+    def apply(self, delta: dict):
+        if delta["full"]:
+            self.guilds = {}
+        for guild_id, projects in delta["guilds"].items():
+            if projects is None:
+                self.guilds.pop(int(guild_id), None)
+            else:
+                self.guilds[int(guild_id)] = projects
+        self.epoch = delta["epoch"]
+        self.version = delta["version"]
+
+    def projects(self, guild_id: int, status: str) -> Optional[list]:
+        projects = self.guilds.get(guild_id)
+        if projects is None:
+            return None
+        return projects.get(status, [])
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import sqlite3
+import time
+from typing import Collection, Optional
+
+
+# n8n으로 보낼 페이로드를 먼저 기록해두는 로컬 스풀 (SQLite WAL)
+# - append는 짧은 간격으로 모아서 한 트랜잭션으로 기록 (group commit)
+# - 전송이 끝난 항목은 ack로 삭제하고, compact로 WAL 파일을 주기적으로 정리
+class PayloadSpool:
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 0.02):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.depth = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self._pending: list[tuple[int, int, dict, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def open(self):
+        async with self._lock:
+            self._conn = await asyncio.to_thread(self._open)
+            self.depth = await asyncio.to_thread(self._count)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS spool ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " channel_id INTEGER NOT NULL,"
+            " message_id INTEGER NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL)"
+        )
+        return conn
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+
+    async def close(self):
+        if self._flush_task is not None:
+            await self._flush_task
+        async with self._lock:
+            if self._conn is not None:
+                await asyncio.to_thread(self._conn.close)
+                self._conn = None
+
+    async def append(self, channel_id: int, message_id: int, payload: dict) -> int:
+        # 기록이 디스크에 커밋된 뒤에 반환 (반환값은 스풀 ID)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((channel_id, message_id, payload, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_soon())
+        return await future
+
+    async def _flush_soon(self):
+        while self._pending:
+            if len(self._pending) < self.batch_size:
+                await asyncio.sleep(self.flush_interval)
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            rows = [(channel_id, message_id, json.dumps(payload, ensure_ascii=False)) for channel_id, message_id, payload, _ in batch]
+            try:
+                async with self._lock:
+                    ids = await asyncio.to_thread(self._insert, rows)
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.depth += len(ids)
+            for (*_, future), row_id in zip(batch, ids):
+                if not future.done():
+                    future.set_result(row_id)
+
+    def _insert(self, rows: list[tuple[int, int, str]]) -> list[int]:
+        now = time.time()
+        ids = []
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            for channel_id, message_id, payload in rows:
+                cursor.execute(
+                    "INSERT INTO spool (channel_id, message_id, payload, created_at) VALUES (?, ?, ?, ?)",
+                    (channel_id, message_id, payload, now),
+                )
+                ids.append(cursor.lastrowid)
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        return ids
+
+    def _execute_many(self, sql: str, ids: list[int]):
+        cursor = self._conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            cursor.executemany(sql, [(row_id,) for row_id in ids])
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+
+    async def peek(self, limit: int, exclude_channels: Collection[int] = ()) -> list[dict]:
+        # 가장 오래된 항목부터 순서대로 반환 (exclude_channels의 항목은 건너뜀)
+        async with self._lock:
+            rows = await asyncio.to_thread(self._peek, limit, list(exclude_channels))
+        return [
+            {"id": row[0], "channel_id": row[1], "message_id": row[2], "payload": json.loads(row[3]), "attempts": row[4]}
+            for row in rows
+        ]
+
+    def _peek(self, limit: int, exclude_channels: list[int]) -> list[tuple]:
+        sql = "SELECT id, channel_id, message_id, payload, attempts FROM spool"
+        if exclude_channels:
+            sql += f" WHERE channel_id NOT IN ({', '.join('?' * len(exclude_channels))})"
+        return self._conn.execute(sql + " ORDER BY id LIMIT ?", (*exclude_channels, limit)).fetchall()
+
+    async def ack(self, ids: list[int]):
+        if not ids:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._execute_many, "DELETE FROM spool WHERE id = ?", ids)
+        self.depth = max(0, self.depth - len(ids))
+
+    async def mark_attempt(self, ids: list[int]):
+        if not ids:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._execute_many, "UPDATE spool SET attempts = attempts + 1 WHERE id = ?", ids)
+
+    async def compact(self):
+        # 삭제된 항목이 차지하던 WAL 공간을 본 DB로 합치고 파일을 비움
+        async with self._lock:
+            await asyncio.to_thread(self._conn.execute, "PRAGMA wal_checkpoint(TRUNCATE)")
+            if self.depth == 0:
+                await asyncio.to_thread(self._conn.execute, "VACUUM")
@@ -0,0 +1,82 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+import discord
+from discord import app_commands
+
+
+# 시작 단계별 소요 시간 기록 (콜드 스타트부터 on_ready까지)
+class StartupTimer:
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self.phases: list[tuple[str, float]] = []
+        self._open: dict[str, float] = {}
+        self.reported = False
+
+    def record(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    def begin(self, name: str):
+        self._open[name] = time.perf_counter()
+
+    def end(self, name: str):
+        started = self._open.pop(name, None)
+        if started is not None:
+            self.record(name, time.perf_counter() - started)
+
+    @contextmanager
+    def phase(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def report(self):
+        # 재연결 시 on_ready가 다시 불려도 한 번만 출력
+        if self.reported:
+            return
+        self.reported = True
+        lines = [f"  {name:<16} {seconds * 1000:9.1f}ms" for name, seconds in self.phases]
+        lines.append(f"  {'total':<16} {(time.perf_counter() - self.started) * 1000:9.1f}ms")
+        print("[startup] 시작 단계별 소요 시간\n" + "\n".join(lines))
+
+
+# --- 커맨드 동기화 ---
+def command_tree_fingerprint(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    payload = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payload.sort(key=lambda command: (command.get("type", 1), command["name"]))
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _read_cache(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_cache(path: str, cache: dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# 마지막으로 동기화한 커맨드 트리와 같으면 (레이트 리밋이 걸린) sync 요청을 건너뜀
+async def sync_commands_if_changed(tree: app_commands.CommandTree, cache_path: str, guild: Optional[discord.abc.Snowflake] = None) -> bool:
+    key = f"{tree.client.application_id}:{guild.id if guild else 'global'}"
+    fingerprint = command_tree_fingerprint(tree, guild)
+    cache = await asyncio.to_thread(_read_cache, cache_path)
+    if cache.get(key) == fingerprint:
+        return False
+    await tree.sync(guild=guild)
+    cache[key] = fingerprint
+    await asyncio.to_thread(_write_cache, cache_path, cache)
+    return True
@@ -0,0 +1,166 @@
+import asyncio
+import time
+import uuid
+from typing import Optional
+
+import discord
+
+from core.text import MESSAGE_LIMIT
+from core.write_scheduler import INTERACTIVE, WriteScheduler
+
+PLACEHOLDER = "…"
+
+
+# n8n이 보내는 부분 출력을 자리표시 메시지에 제자리 수정으로 반영하는 응답 하나
+# - 수정은 interval 간격으로 모아서 한 번에 보냄 (finish는 바로 반영)
+# - 429가 나거나 수정이 느려지면 interval을 늘리고, 여유가 생기면 min_interval까지 줄임
+# - 2000자를 넘으면 현재 메시지를 확정하고 다음 메시지로 이어서 씀
+# - 수정이 실패하면(메시지 삭제, 권한 없음 등) error에 남기고 멈춤
+class ReplyStream:
+    def __init__(self, manager: "ReplyStreamManager", channel: discord.abc.Messageable, message: discord.Message):
+        self.manager = manager
+        self.channel = channel
+        self.messages: list[discord.Message] = [message]
+        self.current = ""  # 마지막 메시지에 들어갈 텍스트
+        self.shown = ""  # 마지막 메시지에 실제로 반영된 텍스트
+        self.interval = manager.min_interval
+        self.edits = 0
+        self.updated_at = time.monotonic()
+        # 수정/전송이 실패하면 여기에 기록하고 더 이상 반영하지 않음 (append/finish가 이 오류를 알림)
+        self.error: Optional[Exception] = None
+        self._dirty = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def append(self, text: str):
+        if not text:
+            return
+        self.current += text
+        self.updated_at = time.monotonic()
+        self._dirty.set()
+
+    async def finish(self, text: str = ""):
+        self.current += text
+        self._finished.set()
+        self._dirty.set()
+        await asyncio.shield(self._task)
+
+    async def _flush_loop(self):
+        try:
+            while True:
+                await self._dirty.wait()
+                self._dirty.clear()
+                await self._flush()
+                if self.finished and not self._dirty.is_set():
+                    return
+                # 다음 수정까지 대기 (그 사이 추가된 텍스트는 한 번의 수정으로 합쳐짐)
+                try:
+                    await asyncio.wait_for(self._finished.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+        except Exception as e:
+            self.error = e
+            print(f"[reply] 스트리밍 응답 수정 실패: {e}")
+
+    async def _flush(self):
+        # 끝의 공백/줄바꿈은 디스코드에 표시되지 않으므로 길이에 넣지 않음 (남는 내용 없이 빈 자리표시 메시지를 만들지 않도록)
+        while len(self.current.rstrip()) > MESSAGE_LIMIT:
+            cut = self.current.rfind("\n", 0, MESSAGE_LIMIT + 1)
+            if cut <= 0:
+                cut = MESSAGE_LIMIT
+            head, self.current = self.current[:cut], self.current[cut:].lstrip("\n")
+            await self._edit(head)
+            message = await self.manager.writes.send_message(self.channel, priority=INTERACTIVE, content=PLACEHOLDER)
+            self.messages.append(message)
+            self.shown = ""
+
+        content = self.current.rstrip()
+        if content and content != self.shown:
+            await self._edit(content)
+            self.shown = content
+
+    async def _edit(self, content: str):
+        writes = self.manager.writes
+        message = self.messages[-1]
+        rate_limited = writes.stats()["rate_limited"]
+        started = time.monotonic()
+        await writes.submit(("message", self.channel.id), lambda: message.edit(content=content), INTERACTIVE)
+        took = time.monotonic() - started
+        self.edits += 1
+
+        if writes.stats()["rate_limited"] > rate_limited:
+            self.interval = min(self.manager.max_interval, self.interval * 2)
+        elif took > self.interval / 2:
+            # discord.py가 내부에서 버킷 대기를 하면 수정 자체가 느려짐
+            self.interval = min(self.manager.max_interval, self.interval * 1.5)
+        else:
+            self.interval = max(self.manager.min_interval, self.interval * 0.8)
+
+
+class ReplyStreamManager:
+    def __init__(self, writes: WriteScheduler, min_interval: float = 1.0, max_interval: float = 5.0, idle_timeout: float = 600.0):
+        self.writes = writes
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.idle_timeout = idle_timeout
+        self._streams: dict[str, ReplyStream] = {}
+        self._finishing: set[asyncio.Task] = set()
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def start(self, channel: discord.abc.Messageable, reply_to: Optional[int] = None, content: str = "") -> str:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_loop())
+        kwargs = {"content": content[:MESSAGE_LIMIT] if content else PLACEHOLDER}
+        if reply_to:
+            kwargs["reference"] = discord.MessageReference(message_id=reply_to, channel_id=channel.id, fail_if_not_exists=False)
+        message = await self.writes.send_message(channel, priority=INTERACTIVE, **kwargs)
+        reply_id = uuid.uuid4().hex
+        stream = ReplyStream(self, channel, message)
+        if content:
+            stream.current = stream.shown = kwargs["content"]
+            stream.append(content[MESSAGE_LIMIT:])
+        self._streams[reply_id] = stream
+        return reply_id
+
+    def get(self, reply_id: str) -> Optional[ReplyStream]:
+        return self._streams.get(reply_id)
+
+    def discard(self, reply_id: str):
+        self._streams.pop(reply_id, None)
+
+    async def finish(self, reply_id: str, text: str = "") -> Optional[ReplyStream]:
+        stream = self._streams.pop(reply_id, None)
+        if stream is not None:
+            await stream.finish(text)
+        return stream
+
+    async def close(self):
+        # 종료 시 남은 응답을 지금까지의 내용으로 확정
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        streams = list(self._streams.values())
+        self._streams.clear()
+        await asyncio.gather(*(stream.finish() for stream in streams), *self._finishing, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {"active": len(self._streams)}
+
+    async def _reap_loop(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout, 60.0))
+            self._expire_idle()
+
+    def _expire_idle(self):
+        # finish 없이 방치된 응답은 지금까지의 내용으로 확정
+        now = time.monotonic()
+        for reply_id, stream in list(self._streams.items()):
+            if now - stream.updated_at > self.idle_timeout:
+                del self._streams[reply_id]
+                task = asyncio.create_task(stream.finish())
+                self._finishing.add(task)
+                task.add_done_callback(self._finishing.discard)
@@ -0,0 +1,21 @@
+MESSAGE_LIMIT = 2000
+
+
+# 디스코드 메시지 길이 제한에 맞게 텍스트를 나눔 (가능하면 줄 단위로 자름)
+def split_message(content: str, limit: int = MESSAGE_LIMIT) -> list[str]:
+    chunks: list[str] = []
+    current = ""
+    for line in content.splitlines(keepends=True):
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(line[:limit])
+            line = line[limit:]
+        if len(current) + len(line) > limit:
+            chunks.append(current)
+            current = ""
+        current += line
+    if current:
+        chunks.append(current)
+    return [chunk for chunk in (chunk.strip("\n") for chunk in chunks) if chunk.strip()]
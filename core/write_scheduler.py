@@ -0,0 +1,213 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+
+import discord
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+
+# 우선순위가 있는 세마포어 (대기 중인 작업 중 우선순위가 높은 것부터 깨움)
+class PrioritySemaphore:
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    async def acquire(self, priority: int):
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._value += 1
+
+
+class _Job:
+    def __init__(self, bucket: Hashable, priority: int, func: Optional[Callable[[], Awaitable[Any]]] = None):
+        self.bucket = bucket
+        self.priority = priority
+        self.func = func
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.started = False
+        # 채널 수정 병합용
+        self.channel = None
+        self.fields: dict = {}
+        self.tag_adds: dict[str, discord.ForumTag] = {}
+        self.tag_removes: set[str] = set()
+
+    async def run(self):
+        if self.func is not None:
+            return await self.func()
+        if self.tag_adds or self.tag_removes:
+            # 실행 직전의 최신 태그 목록을 기준으로 추가/삭제를 한 번에 반영
+            # 이미 있는 이름의 태그는 기존 태그(ID)를 그대로 둠 (ID 없는 태그로 바꾸면 디스코드가 기존 태그를 지우고 새로 만듦)
+            tags = [tag for tag in self.channel.available_tags if tag.name not in self.tag_removes]
+            existing = {tag.name for tag in tags}
+            tags.extend(tag for name, tag in self.tag_adds.items() if name not in existing)
+            self.fields["available_tags"] = tags
+        return await self.channel.edit(**self.fields)
+
+
+# 429 경고 로그를 세어 레이트 리밋 횟수를 집계
+# 핸들러가 아닌 필터로 붙여서 로그는 그대로 출력되게 함 (핸들러를 붙이면 logging.lastResort가 쓰이지 않아 로그가 사라짐)
+class _RateLimitCounter(logging.Filter):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            message = record.getMessage()
+            if "429" in message or "rate limit" in message.lower():
+                self.count += 1
+        return True
+
+
+# 디스코드 쓰기 작업을 한곳에서 처리하는 스케줄러
+# - 라우트 버킷별 큐에서 하나씩 순서대로 실행 (같은 채널에 대한 수정이 서로 덮어쓰지 않음)
+# - 아직 시작되지 않은 같은 채널의 수정/태그 변경은 하나의 edit로 병합
+# - 전체 동시 실행 수를 제한하고, 슬래시 명령어 응답(INTERACTIVE)을 백그라운드 작업보다 먼저 처리
+class WriteScheduler:
+    def __init__(self, max_concurrency: int = 8):
+        self._slots = PrioritySemaphore(max_concurrency)
+        self._queues: dict[Hashable, list[tuple[int, int, _Job]]] = {}
+        self._workers: dict[Hashable, asyncio.Task] = {}
+        self._pending_edits: dict[int, _Job] = {}
+        self._counter = itertools.count()
+        self._rate_limits = _RateLimitCounter()
+        logging.getLogger("discord.http").addFilter(self._rate_limits)
+
+        # 통계
+        self.completed = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.rate_limited = 0
+        self._completed_at: deque[float] = deque(maxlen=10000)
+
+    # --- 공개 API ---
+    async def submit(self, bucket: Hashable, func: Callable[[], Awaitable[Any]], priority: int = BACKGROUND) -> Any:
+        job = _Job(bucket, priority, func)
+        self._enqueue(job)
+        return await job.future
+
+    async def edit_channel(self, channel: discord.abc.GuildChannel, priority: int = BACKGROUND, **fields) -> Any:
+        job = self._edit_job(channel, priority)
+        job.fields.update(fields)
+        return await asyncio.shield(job.future)
+
+    async def update_tags(
+        self,
+        forum: discord.ForumChannel,
+        add: Iterable[discord.ForumTag] = (),
+        remove: Iterable[str] = (),
+        priority: int = BACKGROUND,
+    ) -> Any:
+        job = self._edit_job(forum, priority)
+        for name in remove:
+            job.tag_adds.pop(name, None)
+            job.tag_removes.add(name)
+        for tag in add:
+            job.tag_removes.discard(tag.name)
+            job.tag_adds[tag.name] = tag
+        return await asyncio.shield(job.future)
+
+    async def add_reaction(self, message: discord.abc.Snowflake, emoji: str, priority: int = BACKGROUND):
+        return await self.submit(("reaction", message.channel.id), lambda: message.add_reaction(emoji), priority)
+
+    async def delete_message(self, message: discord.Message, priority: int = BACKGROUND):
+        return await self.submit(("delete_message", message.channel.id), message.delete, priority)
+
+    async def send_message(self, channel: discord.abc.Messageable, priority: int = BACKGROUND, **kwargs) -> discord.Message:
+        return await self.submit(("message", channel.id), lambda: channel.send(**kwargs), priority)
+
+    # --- 내부 처리 ---
+    def _edit_job(self, channel: discord.abc.GuildChannel, priority: int) -> _Job:
+        job = self._pending_edits.get(channel.id)
+        if job is not None and not job.started:
+            self.coalesced += 1
+            if priority < job.priority:
+                # 더 급한 요청이 합쳐지면 우선순위를 올려 다시 넣음 (이전 항목은 실행 시 건너뜀)
+                job.priority = priority
+                self._push(job)
+            return job
+        job = _Job(("channel", channel.id), priority)
+        job.channel = channel
+        self._pending_edits[channel.id] = job
+        self._enqueue(job)
+        return job
+
+    def _push(self, job: _Job):
+        heapq.heappush(self._queues.setdefault(job.bucket, []), (job.priority, next(self._counter), job))
+
+    def _enqueue(self, job: _Job):
+        self._push(job)
+        worker = self._workers.get(job.bucket)
+        if worker is None or worker.done():
+            self._workers[job.bucket] = asyncio.create_task(self._bucket_worker(job.bucket))
+
+    async def _bucket_worker(self, bucket: Hashable):
+        queue = self._queues[bucket]
+        try:
+            while queue:
+                _, _, job = heapq.heappop(queue)
+                if job.started:
+                    continue
+                await self._slots.acquire(job.priority)
+                try:
+                    job.started = True
+                    if job.channel is not None and self._pending_edits.get(job.channel.id) is job:
+                        del self._pending_edits[job.channel.id]
+                    await self._execute(job)
+                finally:
+                    self._slots.release()
+        finally:
+            if not queue:
+                self._queues.pop(bucket, None)
+                self._workers.pop(bucket, None)
+
+    async def _execute(self, job: _Job):
+        try:
+            result = await job.run()
+        except Exception as e:
+            self.failed += 1
+            if isinstance(e, discord.RateLimited) or (isinstance(e, discord.HTTPException) and e.status == 429):
+                self.rate_limited += 1
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+        self.completed += 1
+        self._completed_at.append(time.monotonic())
+        if not job.future.done():
+            job.future.set_result(result)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        recent = sum(1 for finished in self._completed_at if now - finished <= 60)
+        return {
+            "queued": sum(len(queue) for queue in self._queues.values()),
+            "active_buckets": len(self._workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "rate_limited": self.rate_limited + self._rate_limits.count,
+            "throughput_per_minute": recent,
+        }
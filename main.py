@@ -1,25 +1,84 @@
+import time
+STARTED_AT = time.perf_counter()  # import 시간까지 시작 시간에 포함
+
 import discord
 from discord.ext import commands
 import os
 import asyncio
+import codecs
+import datetime
+import hmac
 from dotenv import load_dotenv
 from typing import Optional, List
-import aiohttp
 import re
+import sys
+import yarl
+
+from core.dispatcher import ON_MESSAGE_STAGE, WebhookDispatcher, log_payload
+from core.metrics import metrics, monitor_event_loop
+from core.profiler import profile_event_loop
+from core.spool import PayloadSpool
+from core.write_scheduler import BACKGROUND, WriteScheduler
+from core.streaming import ReplyStream, ReplyStreamManager
+from core.history_cache import HistoryCache
+from core.conversation import ConversationSessions
+from core.autocomplete import AutocompleteService
+from core.batch import run_batch
+from core.dashboard import Dashboard
+from core.guild_config import GuildConfigStore
+from core.archiver import Archiver
+from core.search_index import SearchIndex
+from core.snapshot import ProjectSnapshot
+from core.project_registry import GuildProjects, ProjectRegistry
+from core.startup import StartupTimer, sync_commands_if_changed
 
 # --- New Imports for API Server ---
-from fastapi import FastAPI, HTTPException
-from fastapi_mcp import FastApiMCP
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 import uvicorn
 
 # --- Initial Setup ---
+startup = StartupTimer(STARTED_AT)
+startup.record("imports", time.perf_counter() - STARTED_AT)
 load_dotenv()
 DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
-GUILD_ID = 1411265287491158018 # 테스트 서버 ID
+# API 요청에 guild_id가 없을 때 사용할 기본 서버
+GUILD_ID = int(os.getenv("GUILD_ID", "1411265287491158018"))
+# 설정하면 슬래시 커맨드를 이 서버에만 즉시 동기화 (개발용). 비우면 전역 동기화
+COMMAND_GUILD_ID = os.getenv("COMMAND_GUILD_ID")
+GUILD_CONFIG_PATH = os.getenv("GUILD_CONFIG_PATH", "guild_config.sqlite3")
+# 서버 설정 API(/guilds/{guild_id}/config)에 필요한 토큰. 비우면 설정 API를 사용할 수 없음
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN")
+MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", "0"))
+# 마지막으로 동기화한 커맨드 트리의 fingerprint 저장 위치
+COMMAND_SYNC_CACHE = os.getenv("COMMAND_SYNC_CACHE", ".command_sync.json")
 N8N_WEBHOOK_URL = os.getenv("N8N_WEBHOOK_URL")
+N8N_WORKERS = int(os.getenv("N8N_WORKERS", "4"))
+N8N_SPOOL_PATH = os.getenv("N8N_SPOOL_PATH", "n8n_spool.sqlite3")
+HISTORY_CACHE_CHANNELS = int(os.getenv("HISTORY_CACHE_CHANNELS", "1000"))
+WRITE_CONCURRENCY = int(os.getenv("WRITE_CONCURRENCY", "8"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+# n8n으로 보낼 history 구성 방식: delta(새 메시지만) / budget(PAYLOAD_BUDGET_CHARS 안에서 선별) / full(최근 기록 전체)
+PAYLOAD_MODE = os.getenv("PAYLOAD_MODE", "delta")
+PAYLOAD_BUDGET_CHARS = int(os.getenv("PAYLOAD_BUDGET_CHARS", "4000"))
+PAYLOAD_LOG_SAMPLE_RATE = float(os.getenv("PAYLOAD_LOG_SAMPLE_RATE", "0.01"))
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+ARCHIVE_PATH = os.getenv("ARCHIVE_PATH", "archive")
+ARCHIVE_CONCURRENCY = int(os.getenv("ARCHIVE_CONCURRENCY", "4"))
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", os.path.join(ARCHIVE_PATH, "search.sqlite3"))
+REPLY_EDIT_INTERVAL = float(os.getenv("REPLY_EDIT_INTERVAL", "1.0"))
+# inline: 봇과 API를 한 이벤트 루프에서 실행 / split: API는 별도 워커 프로세스(api_worker.py)로 실행
+API_MODE = os.getenv("API_MODE", "inline")
+API_WORKERS = int(os.getenv("API_WORKERS", "4"))
+GATEWAY_SOCKET = os.getenv("GATEWAY_SOCKET", "/tmp/knowledge-bot-gateway.sock")
 
-intents = discord.Intents.default()
+# 서버 수백 개에서도 메모리가 늘지 않도록 필요한 이벤트만 받음
+# (멤버/프레즌스/음성/타이핑 이벤트와 멤버 캐시는 사용하지 않음)
+intents = discord.Intents.none()
+intents.guilds = True
+intents.guild_messages = True
+intents.dm_messages = True
 intents.message_content = True
 
 # --- FastAPI Setup ---
@@ -29,33 +88,201 @@ app = FastAPI(
     description="description",
     version="0.1.0",
 )
-mcp = FastApiMCP(
-    app,
-    name="name",
-    description="description",
-)
-mcp.mount_http()
+
+def setup_mcp():
+    # fastapi_mcp는 무거우므로 API 서버를 띄울 때만 import (모든 라우트가 등록된 뒤 호출)
+    from fastapi_mcp import FastApiMCP
+    mcp = FastApiMCP(
+        app,
+        name="name",
+        description="description",
+    )
+    mcp.mount_http()
+    mcp.setup_server()
+    return mcp
 
 # --- Bot Client Definition ---
-class MyBot(commands.Bot):
+class MyBot(commands.AutoShardedBot):
     def __init__(self):
-        super().__init__(command_prefix='!', intents=intents)
+        super().__init__(
+            command_prefix='!',
+            intents=intents,
+            member_cache_flags=discord.MemberCacheFlags.none(),
+            # 대화 기록은 HistoryCache가 관리하므로 discord.py 메시지 캐시는 기본적으로 끔
+            max_messages=MESSAGE_CACHE_SIZE or None,
+            chunk_guilds_at_startup=False,
+        )
+        # 서버별 설정 (카테고리 이름, n8n 웹훅)
+        self.guild_config = GuildConfigStore(GUILD_CONFIG_PATH)
+        # 모든 디스코드 쓰기 작업(채널 수정, 리액션, 메시지 삭제 등)은 이 스케줄러를 거침
+        self.writes = WriteScheduler(max_concurrency=WRITE_CONCURRENCY)
+        self.dispatcher = WebhookDispatcher(
+            N8N_WEBHOOK_URL,
+            PayloadSpool(N8N_SPOOL_PATH),
+            react=self.react_background,
+            workers=N8N_WORKERS,
+            url_for=self.webhook_url_for,
+            on_drop=self.payload_dropped,
+        )
+        self.history_cache = HistoryCache(depth=20, max_channels=HISTORY_CACHE_CHANNELS)
+        # 채널별 대화 세션 ID와 마지막으로 보낸 메시지 커서
+        self.conversations = ConversationSessions(PAYLOAD_MODE, budget_chars=PAYLOAD_BUDGET_CHARS)
+        # main.py의 API와 모든 코그가 공유하는 프로젝트 색인
+        self.projects = ProjectRegistry(self.guild_config.category_names)
+        # 프로젝트/태그 자동완성 색인 (프로젝트 색인 변경을 받아 점진적으로 갱신)
+        self.autocomplete = AutocompleteService()
+        self.projects.add_listener(self.autocomplete)
+        # 시스템 상태 대시보드 카운터 (이벤트로 갱신, 게시는 DashboardCog가 담당)
+        self.dashboard = Dashboard(self.projects, self.dispatcher.guild_stats)
+        self.projects.add_listener(self.dashboard)
+        # 분리 모드의 API 워커에 복제할 프로젝트 목록
+        self.snapshot = ProjectSnapshot(self.projects)
+        self.projects.add_listener(self.snapshot)
+        # 프로젝트 포럼 스레드를 지식 베이스로 보관 (스윕과 실시간 기록은 ArchiveCog가 담당)
+        self.archiver = Archiver(self.projects, ARCHIVE_PATH, concurrency=ARCHIVE_CONCURRENCY)
+        # 보관된 메시지의 전문 검색 색인 (보관 기록을 받아 점진적으로 갱신)
+        self.search = SearchIndex(SEARCH_INDEX_PATH)
+        self.archiver.add_listener(self.search)
+        self.search_backfill: Optional[asyncio.Task] = None
+        # n8n이 스트리밍으로 보내는 응답을 메시지 수정으로 반영
+        self.replies = ReplyStreamManager(self.writes, min_interval=REPLY_EDIT_INTERVAL)
+        self.loop_monitor: Optional[asyncio.Task] = None
 
     async def setup_hook(self):
-        # cogs 폴더에서 .py로 끝나는 모든 파일을 찾아 코그로 로드
-        for filename in os.listdir('./cogs'):
-            if filename.endswith('.py'):
-                await self.load_extension(f'cogs.{filename[:-3]}')
-        
-        # 특정 서버에만 커맨드를 즉시 동기화 (개발용)
-        my_guild = discord.Object(id=GUILD_ID)
-        self.tree.copy_global_to(guild=my_guild)
-        await self.tree.sync(guild=my_guild)
+        startup.end("login")
+        self.loop_monitor = asyncio.create_task(monitor_event_loop())
+
+        # 서버 설정, 보관 체크포인트 로드와 n8n 스풀/세션/드레이너 시작 (남아있는 스풀은 이어서 재전송)
+        with startup.phase("storage"):
+            await asyncio.gather(self.guild_config.open(), self.dispatcher.start(), self.archiver.open(), self.search.open())
+        if self.search.documents == 0:
+            # 색인이 처음 만들어졌으면 이미 보관된 기록으로 백그라운드에서 채움
+            self.search_backfill = asyncio.create_task(self.backfill_search())
+
+        # cogs 폴더의 코그들은 서로 의존하지 않으므로 동시에 로드
+        with startup.phase("cogs"):
+            extensions = sorted(f'cogs.{filename[:-3]}' for filename in os.listdir('./cogs') if filename.endswith('.py'))
+            await asyncio.gather(*(self.load_extension(extension) for extension in extensions))
+
+        # 커맨드 트리가 마지막 동기화 때와 같으면 sync를 건너뜀
+        with startup.phase("command_sync"):
+            my_guild = None
+            if COMMAND_GUILD_ID:
+                # 특정 서버에만 커맨드를 즉시 동기화 (개발용)
+                my_guild = discord.Object(id=int(COMMAND_GUILD_ID))
+                self.tree.copy_global_to(guild=my_guild)
+            synced = await sync_commands_if_changed(self.tree, COMMAND_SYNC_CACHE, guild=my_guild)
+            print(f"[startup] 커맨드 트리 {'동기화' if synced else '변경 없음, 동기화 생략'}")
+        startup.begin("gateway")
+
+    async def launch_shards(self):
+        # 기본 구현은 샤드를 하나씩 5초 간격으로 연결함
+        # IDENTIFY는 shard_id % max_concurrency 버킷마다 5초에 한 번이므로 버킷끼리는 동시에 연결
+        if self.is_closed():
+            return
+        shard_count, gateway_url, session_start_limit = await self.http.get_bot_gateway()
+        if self.shard_count is None:
+            self.shard_count = shard_count
+        self._connection.shard_count = self.shard_count
+        shard_ids = self.shard_ids or range(self.shard_count)
+        self._connection.shard_ids = shard_ids
+        gateway = yarl.URL(gateway_url)
+
+        max_concurrency = max(1, session_start_limit.get("max_concurrency", 1))
+        buckets: dict[int, list[int]] = {}
+        for shard_id in shard_ids:
+            buckets.setdefault(shard_id % max_concurrency, []).append(shard_id)
+
+        async def launch_bucket(bucket: list[int]):
+            for index, shard_id in enumerate(bucket):
+                # initial=True인 첫 샤드만 대기 없이 IDENTIFY
+                await self.launch_shard(gateway, shard_id, initial=index == 0)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(launch_bucket(bucket) for bucket in buckets.values()))
+        print(f"[shard] {len(shard_ids)}개 샤드 연결 완료 (max_concurrency={max_concurrency}, {time.perf_counter() - started:.1f}s)")
+
+    async def backfill_search(self):
+        try:
+            loaded = await self.search.load_archive(ARCHIVE_PATH)
+            if loaded:
+                print(f"[search] 보관 기록 {loaded}개로 검색 색인을 채웠습니다.")
+        except Exception as e:
+            print(f"[search] 검색 색인 채우기 실패: {e}")
+
+    def webhook_url_for(self, payload: dict) -> Optional[str]:
+        guild_id = payload.get("guildId")
+        return self.guild_config.get(int(guild_id)).webhook_url if guild_id else None
+
+    def payload_dropped(self, payload: dict):
+        # n8n이 거부한 페이로드의 메시지는 다음 페이로드에 다시 실음
+        self.conversations.dropped(payload)
+
+    async def react_background(self, channel_id: int, message_id: int, emoji: str):
+        message = self.get_partial_messageable(channel_id).get_partial_message(message_id)
+        await self.writes.add_reaction(message, emoji, priority=BACKGROUND)
+
+    async def close(self):
+        if self.loop_monitor is not None:
+            self.loop_monitor.cancel()
+        await self.replies.close()
+        await self.dispatcher.close()
+        await self.guild_config.close()
+        if self.search_backfill is not None:
+            self.search_backfill.cancel()
+        await self.archiver.close()
+        await self.search.close()
+        await super().close()
 
     async def on_ready(self):
         print(f'{self.user} (으)로 로그인했습니다.')
+        startup.end("gateway")
+        startup.report()
+
+    # --- 프로젝트 색인 유지 ---
+    async def on_guild_available(self, guild: discord.Guild):
+        self.projects.load_guild(guild)
+
+    async def on_guild_join(self, guild: discord.Guild):
+        self.projects.load_guild(guild)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.projects.unload_guild(guild.id)
+
+    async def on_guild_channel_create(self, channel):
+        self.projects.on_channel_create(channel)
+
+    async def on_guild_channel_update(self, before, after):
+        self.projects.on_channel_update(before, after)
+
+    async def on_thread_create(self, thread: discord.Thread):
+        # 새 게시물이 올라온 프로젝트를 자동완성 최근 순위에 반영
+        self.autocomplete.project_touched(thread.guild.id, thread.parent_id, thread.id)
+
+    # --- 대화 기록 캐시 유지 ---
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        if "content" in payload.data:
+            self.history_cache.update(payload.channel_id, payload.message_id, payload.data["content"])
+
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        self.history_cache.remove(payload.channel_id, {payload.message_id})
+
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        self.history_cache.remove(payload.channel_id, payload.message_ids)
+
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
+        self.history_cache.drop(payload.thread_id)
+        self.conversations.reset(payload.thread_id)
+
+    async def on_guild_channel_delete(self, channel):
+        self.projects.on_channel_delete(channel)
+        self.history_cache.drop(channel.id)
+        self.conversations.reset(channel.id)
 
     async def on_message(self, message):
+        # 봇 자신의 메시지도 대화 기록(assistant)으로 남겨야 하므로 먼저 캐시에 기록
+        self.history_cache.record(message)
+
         if message.author == self.user:
             return
 
@@ -75,21 +302,20 @@ class MyBot(commands.Bot):
         #     message_type = "THREAD_MESSAGE"
 
         if should_send:
-            history = []
-            async for prev_message in message.channel.history(limit=20):
-                role = "assistant" if prev_message.author == self.user else "user"
-                speaker_name = prev_message.author.display_name.replace('"', "'")
-                history.append({
-                    "role": role,
-                    "name": speaker_name,
-                    "content": prev_message.content
-                })
-            history.reverse()
+            # 캐시가 비어있는 채널만 REST로 history를 읽음
+            with ON_MESSAGE_STAGE.time(stage="history_fetch"):
+                entries = await self.history_cache.get(message.channel)
+
+            build_started = time.perf_counter()
+            # 세션의 커서 이후 메시지만 (또는 예산 안에서 선별해) 보내고 커서를 옮김
+            history, session = self.conversations.build(message.channel.id, entries, self.user.id)
 
             payload = {
                 "userId": str(message.author.id),
                 "userName": message.author.name,
                 "channelId": str(message.channel.id),
+                "guildId": str(message.guild.id) if message.guild else None,
+                "session": session,
                 "history": history,
                 "type": message_type
             }
@@ -98,109 +324,407 @@ class MyBot(commands.Bot):
                 payload["threadId"] = str(message.channel.id)
                 payload["threadName"] = message.channel.name
 
-            print(f"[TO n8n] {payload}")
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(N8N_WEBHOOK_URL, json=payload) as response:
-                        if response.status == 200:
-                            await message.add_reaction("✅")
-                        else:
-                            await message.add_reaction("❌")
-                            print(f"n8n webhook returned status: {response.status}")
-            except Exception as e:
-                await message.add_reaction("🔥")
-                print(f"Error sending to n8n: {e}")
+            ON_MESSAGE_STAGE.observe(time.perf_counter() - build_started, stage="payload_build")
+
+            log_payload(payload, PAYLOAD_LOG_SAMPLE_RATE)
+            # 스풀에 기록만 하고 반환. 전송은 드레이너가 처리하고, 완료 시 ✅/❌/🔥 리액션을 남김
+            with ON_MESSAGE_STAGE.time(stage="spool_append"):
+                await self.dispatcher.submit(message, payload)
 
 # --- Global Bot Instance ---
 bot = MyBot()
 
+# --- Metrics ---
+API_LATENCY = metrics.histogram("api_request_seconds", "Latency of each API endpoint.", ("method", "route", "status"))
+metrics.gauge("discord_gateway_latency_seconds", "Gateway heartbeat latency.").set_function(lambda: bot.latency)
+metrics.gauge("n8n_spool_depth", "Payloads waiting in the n8n spool.").set_function(lambda: bot.dispatcher.spool.depth)
+metrics.counter("history_cache_hits_total", "History cache hits.").set_function(lambda: bot.history_cache.hits)
+metrics.counter("history_cache_misses_total", "History cache misses (REST loads).").set_function(lambda: bot.history_cache.misses)
+metrics.gauge("discord_writes_queued", "Discord writes waiting in the scheduler.").set_function(lambda: bot.writes.stats()["queued"])
+metrics.counter("discord_writes_rate_limited_total", "Discord writes that hit a 429.").set_function(lambda: bot.writes.stats()["rate_limited"])
+metrics.gauge("reply_streams_active", "Streaming replies that have not finished yet.").set_function(lambda: bot.replies.stats()["active"])
+
+@app.middleware("http")
+async def record_api_latency(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        API_LATENCY.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=status,
+        )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint() -> PlainTextResponse:
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.post("/debug/profile", include_in_schema=False)
+async def profile_endpoint(seconds: float = 10.0, interval_ms: float = 5.0) -> PlainTextResponse:
+    # PROFILING_ENABLED일 때만 사용 가능. 결과는 flamegraph용 collapsed stack 형식
+    if not PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled.")
+    seconds = min(max(seconds, 0.1), 120.0)
+    return PlainTextResponse(await profile_event_loop(seconds, max(interval_ms, 1.0) / 1000))
+
+@app.get("/internal/snapshot", include_in_schema=False)
+async def snapshot_endpoint(epoch: Optional[str] = None, since: int = 0, wait: float = 0.0) -> dict:
+    # API 워커가 long-poll로 호출. since 이후 바뀐 서버의 프로젝트 목록만 반환
+    await bot.snapshot.wait(epoch, since, min(max(wait, 0.0), 60.0))
+    return bot.snapshot.delta(epoch, since)
+
 # --- API Models ---
+# guild_id를 생략하면 기본 서버(GUILD_ID)에 적용
 class ProjectChannelRequest(BaseModel):
     channel_name: str
-    category_name: str = "Active Projects"
+    category_name: Optional[str] = None  # 생략하면 서버 설정의 진행중 카테고리
     guideline: str
+    guild_id: Optional[int] = None
 
 class ProjectStatusRequest(BaseModel):
     channel_name: str
+    guild_id: Optional[int] = None
+
+class ProjectIdRequest(BaseModel):
+    channel_id: int
+    guild_id: Optional[int] = None
 
 class ProjectInfo(BaseModel):
     id: int
     name: str
 
-# --- API Endpoints ---
-@app.post("/new_project", operation_id="new_project")
-async def new_project(request: ProjectChannelRequest) -> dict:
-    guild = bot.get_guild(GUILD_ID)
+class ProjectRef(BaseModel):
+    channel_id: Optional[int] = None
+    channel_name: Optional[str] = None
+
+class BatchNewProjectRequest(BaseModel):
+    projects: List[ProjectChannelRequest]
+    guild_id: Optional[int] = None
+
+class BatchProjectStatusRequest(BaseModel):
+    projects: List[ProjectRef]
+    guild_id: Optional[int] = None
+
+class SearchResult(BaseModel):
+    id: int
+    guild_id: int
+    project_id: int
+    project: str
+    thread_id: int
+    thread: str
+    tags: List[str]
+    author: str
+    created_at: str
+    snippet: str
+    score: Optional[float] = None
+    jump_url: str
+
+class GuildConfigRequest(BaseModel):
+    active_category: Optional[str] = None
+    completed_category: Optional[str] = None
+    webhook_url: Optional[str] = None
+
+class ReplyStartRequest(BaseModel):
+    channel_id: int
+    reply_to_message_id: Optional[int] = None
+    content: str = ""
+
+class ReplyAppendRequest(BaseModel):
+    reply_id: str
+    text: str
+
+class ReplyFinishRequest(BaseModel):
+    reply_id: str
+    text: str = ""
+
+# --- API Helpers ---
+def get_guild(guild_id: Optional[int]) -> discord.Guild:
+    guild = bot.get_guild(guild_id or GUILD_ID)
     if not guild:
         raise HTTPException(status_code=500, detail="Bot is not in the specified guild.")
-    category = discord.utils.get(guild.categories, name=request.category_name)
+    return guild
+
+def get_guild_projects(guild_id: Optional[int]) -> GuildProjects:
+    return bot.projects.guild(get_guild(guild_id).id)
+
+def find_project_by_name(projects: GuildProjects, channel_name: str) -> discord.ForumChannel:
+    matches = projects.find(channel_name)
+    if not matches:
+        raise HTTPException(status_code=404, detail=f"Forum channel '{channel_name}' not found.")
+    if len(matches) > 1:
+        ids = ", ".join(str(channel.id) for channel in matches)
+        raise HTTPException(status_code=409, detail=f"Forum channel name '{channel_name}' is ambiguous ({ids}). Use the id-based endpoint instead.")
+    return matches[0]
+
+def find_project_by_id(projects: GuildProjects, channel_id: int) -> discord.ForumChannel:
+    channel = projects.get(channel_id)
+    if not channel:
+        raise HTTPException(status_code=404, detail=f"Forum channel '{channel_id}' not found.")
+    return channel
+
+def find_project(projects: GuildProjects, ref: ProjectRef) -> discord.ForumChannel:
+    if ref.channel_id is not None:
+        return find_project_by_id(projects, ref.channel_id)
+    if ref.channel_name is not None:
+        return find_project_by_name(projects, ref.channel_name)
+    raise HTTPException(status_code=422, detail="Either channel_id or channel_name is required.")
+
+async def create_project(guild: discord.Guild, request: ProjectChannelRequest) -> dict:
+    category_name = request.category_name or bot.guild_config.get(guild.id).active_category
+    category = bot.projects.guild(guild.id).categories.get(category_name)
     if not category:
-        raise HTTPException(status_code=404, detail=f"Category '{request.category_name}' not found.")
+        raise HTTPException(status_code=404, detail=f"Category '{category_name}' not found.")
     default_tags = [discord.ForumTag(name=n, emoji=e) for n, e in [("bug","🐛"),("documentation","📄"),("duplicate","👯"),("enhancement","✨"),("good first issue","👍"),("help wanted","🙋"),("invalid","❗"),("question","❓"),("wontfix","🤷")]]
     try:
-        forum_channel = await guild.create_forum(name=request.channel_name, category=category, topic=request.guideline, available_tags=default_tags, default_reaction_emoji="✅")
+        forum_channel = await bot.writes.submit(
+            ("create_channel", guild.id),
+            lambda: guild.create_forum(name=request.channel_name, category=category, topic=request.guideline, available_tags=default_tags, default_reaction_emoji="✅"),
+        )
+        # 생성 이벤트보다 응답이 먼저 올 수 있으므로 바로 색인에 반영
+        bot.projects.on_channel_create(forum_channel)
         return {"status": "success", "channel_id": forum_channel.id, "channel_mention": forum_channel.mention}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/complete_project", operation_id="complete_project")
-async def complete_project(request: ProjectStatusRequest) -> dict:
-    guild = bot.get_guild(GUILD_ID)
-    if not guild:
-        raise HTTPException(status_code=500, detail="Bot is not in the specified guild.")
-    channel_to_move = discord.utils.get(guild.forums, name=request.channel_name)
-    if not channel_to_move:
-        raise HTTPException(status_code=404, detail=f"Forum channel '{request.channel_name}' not found.")
-    completed_category = discord.utils.get(guild.categories, name="Completed Projects")
-    if not completed_category:
-        raise HTTPException(status_code=404, detail="Category 'Completed Projects' not found.")
+async def move_project(projects: GuildProjects, channel: discord.ForumChannel, status: str) -> dict:
+    category_name = projects.category_names[status]
+    category = projects.category_for(status)
+    if not category:
+        raise HTTPException(status_code=404, detail=f"Category '{category_name}' not found.")
     try:
-        await channel_to_move.edit(category=completed_category)
-        return {"status": "success", "message": f"Project '{request.channel_name}' has been moved to Completed Projects."}
+        await bot.writes.edit_channel(channel, category=category)
+        return {"status": "success", "channel_id": channel.id, "message": f"Project '{channel.name}' has been moved to {category_name}."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- API Endpoints ---
+@app.post("/new_project", operation_id="new_project")
+async def new_project(request: ProjectChannelRequest) -> dict:
+    return await create_project(get_guild(request.guild_id), request)
+
+@app.post("/complete_project", operation_id="complete_project")
+async def complete_project(request: ProjectStatusRequest) -> dict:
+    projects = get_guild_projects(request.guild_id)
+    return await move_project(projects, find_project_by_name(projects, request.channel_name), "completed")
+
+@app.post("/complete_project_by_id", operation_id="complete_project_by_id")
+async def complete_project_by_id(request: ProjectIdRequest) -> dict:
+    projects = get_guild_projects(request.guild_id)
+    return await move_project(projects, find_project_by_id(projects, request.channel_id), "completed")
+
 @app.post("/reactivate_project", operation_id="reactivate_project")
 async def reactivate_project(request: ProjectStatusRequest) -> dict:
-    guild = bot.get_guild(GUILD_ID)
-    if not guild:
-        raise HTTPException(status_code=500, detail="Bot is not in the specified guild.")
-    channel_to_move = discord.utils.get(guild.forums, name=request.channel_name)
-    if not channel_to_move:
-        raise HTTPException(status_code=404, detail=f"Forum channel '{request.channel_name}' not found.")
-    active_category = discord.utils.get(guild.categories, name="Active Projects")
-    if not active_category:
-        raise HTTPException(status_code=404, detail="Category 'Active Projects' not found.")
-    try:
-        await channel_to_move.edit(category=active_category)
-        return {"status": "success", "message": f"Project '{request.channel_name}' has been moved to Active Projects."}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    projects = get_guild_projects(request.guild_id)
+    return await move_project(projects, find_project_by_name(projects, request.channel_name), "active")
+
+@app.post("/reactivate_project_by_id", operation_id="reactivate_project_by_id")
+async def reactivate_project_by_id(request: ProjectIdRequest) -> dict:
+    projects = get_guild_projects(request.guild_id)
+    return await move_project(projects, find_project_by_id(projects, request.channel_id), "active")
 
 @app.get("/list_projects", operation_id="list_projects", response_model=List[ProjectInfo])
-async def list_projects(status: str = "active") -> List[ProjectInfo]:
-    guild = bot.get_guild(GUILD_ID)
-    if not guild:
-        raise HTTPException(status_code=500, detail="Bot is not in the specified guild.")
-    category_name = "Active Projects" if status == "active" else "Completed Projects"
-    category = discord.utils.get(guild.categories, name=category_name)
-    if not category:
-        return []
-    projects = [ProjectInfo(id=channel.id, name=channel.name) for channel in category.forums]
-    return projects
+async def list_projects(status: str = "active", guild_id: Optional[int] = None) -> List[ProjectInfo]:
+    projects = get_guild_projects(guild_id)
+    status = "active" if status == "active" else "completed"
+    return [ProjectInfo(id=channel.id, name=channel.name) for channel in projects.projects(status)]
+
+@app.get("/search_messages", operation_id="search_messages", response_model=List[SearchResult])
+async def search_messages(
+    query: str,
+    guild_id: Optional[int] = None,
+    project: Optional[str] = None,
+    project_id: Optional[int] = None,
+    thread_id: Optional[int] = None,
+    tag: Optional[str] = None,
+    after: Optional[datetime.datetime] = None,
+    before: Optional[datetime.datetime] = None,
+    include_bots: bool = True,
+    limit: int = 10,
+) -> List[SearchResult]:
+    # 보관된 프로젝트 스레드 메시지를 관련도 순으로 검색 (디스코드 API를 호출하지 않음)
+    if not query.strip():
+        raise HTTPException(status_code=422, detail="query must not be empty.")
+    results = await bot.search.search(
+        query,
+        guild_id=guild_id or GUILD_ID,
+        project=project,
+        project_id=project_id,
+        thread_id=thread_id,
+        tag=tag,
+        after=after,
+        before=before,
+        include_bots=include_bots,
+        limit=min(max(limit, 1), 50),
+    )
+    return [SearchResult(**result) for result in results]
+
+# --- Batch API Endpoints ---
+# 채널 생성(서버 단위)과 채널 수정(채널 단위)의 버킷별 순서는 bot.writes가 지키므로, 여기서는 진행 중인 항목 수만 제한
+@app.post("/batch/new_projects", operation_id="batch_new_projects")
+async def batch_new_projects(request: BatchNewProjectRequest) -> dict:
+    # 항목에 guild_id가 없으면 요청의 guild_id(또는 기본 서버)를 사용
+    def guild_id_of(item: ProjectChannelRequest) -> int:
+        return item.guild_id or request.guild_id or GUILD_ID
+
+    return await run_batch(
+        request.projects,
+        lambda item: create_project(get_guild(guild_id_of(item)), item),
+        BATCH_CONCURRENCY,
+    )
+
+async def batch_move_projects(refs: List[ProjectRef], status: str, guild_id: Optional[int]) -> dict:
+    projects = get_guild_projects(guild_id)
+    # 같은 채널을 가리키는 항목은 이름/ID와 상관없이 bot.writes의 채널 버킷에서 순서대로 (합쳐서) 처리됨
+    return await run_batch(
+        refs,
+        lambda ref: move_project(projects, find_project(projects, ref), status),
+        BATCH_CONCURRENCY,
+    )
+
+@app.post("/batch/complete_projects", operation_id="batch_complete_projects")
+async def batch_complete_projects(request: BatchProjectStatusRequest) -> dict:
+    return await batch_move_projects(request.projects, "completed", request.guild_id)
+
+@app.post("/batch/reactivate_projects", operation_id="batch_reactivate_projects")
+async def batch_reactivate_projects(request: BatchProjectStatusRequest) -> dict:
+    return await batch_move_projects(request.projects, "active", request.guild_id)
+
+# --- Guild Config Endpoints ---
+# 웹훅 URL을 다루므로 MCP 도구로는 노출하지 않고, ADMIN_API_TOKEN을 가진 요청만 허용
+def require_admin(authorization: Optional[str] = Header(None)):
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(status_code=403, detail="Guild config API is disabled. Set ADMIN_API_TOKEN to enable it.")
+    if authorization is None or not hmac.compare_digest(authorization.encode("utf-8"), f"Bearer {ADMIN_API_TOKEN}".encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid admin token.", headers={"WWW-Authenticate": "Bearer"})
+
+@app.get("/guilds/{guild_id}/config", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def get_guild_config(guild_id: int) -> dict:
+    return {"guild_id": guild_id, **bot.guild_config.get(guild_id).to_dict()}
+
+@app.put("/guilds/{guild_id}/config", include_in_schema=False, dependencies=[Depends(require_admin)])
+async def update_guild_config(guild_id: int, request: GuildConfigRequest) -> dict:
+    config = await bot.guild_config.update(guild_id, **request.model_dump())
+    # 카테고리 이름이 바뀌었을 수 있으므로 색인을 다시 만듦
+    guild = bot.get_guild(guild_id)
+    if guild:
+        bot.projects.load_guild(guild)
+    return {"guild_id": guild_id, **config.to_dict()}
+
+# --- Streaming Reply Endpoints ---
+# n8n은 start로 자리표시 메시지를 만들고 append를 반복한 뒤 finish를 호출하거나,
+# /reply/stream에 chunked 본문으로 출력을 흘려보내면 됨
+def get_reply_stream(reply_id: str) -> ReplyStream:
+    stream = bot.replies.get(reply_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail=f"Reply '{reply_id}' not found or already finished.")
+    return stream
+
+def check_reply_stream(reply_id: str, stream: ReplyStream):
+    # 메시지 수정이 실패해 더 이상 반영되지 않는 응답이면 오류로 알림
+    if stream.error is None:
+        return
+    bot.replies.discard(reply_id)
+    e = stream.error
+    status = e.status if isinstance(e, discord.HTTPException) and e.status in (403, 404) else 500
+    raise HTTPException(status_code=status, detail=f"Reply '{reply_id}' stopped updating: {e}")
+
+def reply_result(reply_id: str, stream: ReplyStream) -> dict:
+    return {
+        "status": "success",
+        "reply_id": reply_id,
+        "channel_id": stream.channel.id,
+        "message_ids": [message.id for message in stream.messages],
+    }
+
+async def start_reply_stream(channel_id: int, reply_to_message_id: Optional[int], content: str) -> str:
+    try:
+        return await bot.replies.start(bot.get_partial_messageable(channel_id), reply_to_message_id, content)
+    except discord.HTTPException as e:
+        raise HTTPException(status_code=e.status if e.status in (403, 404) else 500, detail=str(e))
+
+@app.post("/reply/start", operation_id="start_reply")
+async def start_reply(request: ReplyStartRequest) -> dict:
+    reply_id = await start_reply_stream(request.channel_id, request.reply_to_message_id, request.content)
+    return reply_result(reply_id, bot.replies.get(reply_id))
+
+@app.post("/reply/append", operation_id="append_reply")
+async def append_reply(request: ReplyAppendRequest) -> dict:
+    stream = get_reply_stream(request.reply_id)
+    check_reply_stream(request.reply_id, stream)
+    stream.append(request.text)
+    return {"status": "success", "reply_id": request.reply_id, "length": len(stream.current)}
+
+@app.post("/reply/finish", operation_id="finish_reply")
+async def finish_reply(request: ReplyFinishRequest) -> dict:
+    get_reply_stream(request.reply_id)
+    stream = await bot.replies.finish(request.reply_id, request.text)
+    check_reply_stream(request.reply_id, stream)
+    return reply_result(request.reply_id, stream)
+
+@app.post("/reply/stream", include_in_schema=False)
+async def stream_reply(request: Request, channel_id: int, reply_to_message_id: Optional[int] = None) -> dict:
+    # 본문(UTF-8 텍스트)을 받는 대로 이어 붙이고, 요청이 끝나면 응답도 확정
+    reply_id = await start_reply_stream(channel_id, reply_to_message_id, "")
+    stream = bot.replies.get(reply_id)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    try:
+        async for chunk in request.stream():
+            if stream.error is not None:
+                break
+            stream.append(decoder.decode(chunk))
+        stream.append(decoder.decode(b"", final=True))
+    finally:
+        await bot.replies.finish(reply_id)
+    check_reply_stream(reply_id, stream)
+    return reply_result(reply_id, stream)
 
 # --- Main Execution Logic ---
 async def run_bot():
+    # bot.start는 bot.run과 달리 로깅을 설정하지 않으므로, 레이트 리밋/요청 실패 경고가 보이도록 직접 설정
+    discord.utils.setup_logging()
+    startup.begin("login")
     await bot.start(DISCORD_BOT_TOKEN)
 
 async def run_api():
     config = uvicorn.Config(app, host="0.0.0.0", port=8000, log_level="info")
     server = uvicorn.Server(config)
-    mcp.setup_server()
+    with startup.phase("mcp_setup"):
+        setup_mcp()
+    await server.serve()
+
+async def run_gateway_api():
+    # 분리 모드: 게이트웨이 프로세스는 유닉스 소켓으로만 API를 열고, 외부 요청은 워커들이 받아 전달
+    # MCP 세션은 프로세스 메모리에 있으므로 MCP는 게이트웨이 한 곳에서만 처리
+    with startup.phase("mcp_setup"):
+        setup_mcp()
+    config = uvicorn.Config(app, uds=GATEWAY_SOCKET, log_level="warning")
+    server = uvicorn.Server(config)
     await server.serve()
 
+async def run_api_workers():
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "api_worker:app",
+        "--host", "0.0.0.0", "--port", "8000", "--workers", str(API_WORKERS),
+        env={**os.environ, "GATEWAY_SOCKET": GATEWAY_SOCKET},
+    )
+    try:
+        await process.wait()
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+
 async def main():
-    await asyncio.gather(run_bot(), run_api())
+    if API_MODE == "split":
+        await asyncio.gather(run_bot(), run_gateway_api(), run_api_workers())
+    else:
+        await asyncio.gather(run_bot(), run_api())
 
 if __name__ == "__main__":
     asyncio.run(main())
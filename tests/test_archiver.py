@@ -0,0 +1,57 @@
+import asyncio
+
+from bench.fakes import FakeMessage, FakeUser, build_guild
+from core.archiver import Archiver
+from core.project_registry import ProjectRegistry
+
+
+# 검색 색인 대신 기록된 메시지 ID만 모으는 리스너
+class RecordingListener:
+    def __init__(self):
+        self.ids: list[int] = []
+
+    async def archived(self, records: list[dict]):
+        self.ids.extend(record["id"] for record in records)
+
+
+def test_failed_live_message_holds_checkpoint(tmp_path):
+    async def scenario():
+        guild = build_guild(1, rest_latency=0, threads_per_project=1, messages_per_thread=3, archived_ratio=0.0)
+        registry = ProjectRegistry()
+        registry.load_guild(guild)
+        archiver = Archiver(registry, str(tmp_path))
+        listener = RecordingListener()
+        archiver.add_listener(listener)
+        await archiver.open()
+        await archiver.sweep(guild)
+
+        thread = guild.threads[0]
+        swept = thread.messages[-1].id
+        author = FakeUser("member")
+        failed, later = FakeMessage(thread, author, "실패할 메시지"), FakeMessage(thread, author, "다음 메시지")
+        thread.messages += [failed, later]
+
+        # 첫 실시간 메시지의 파일 기록만 실패시킴
+        write = archiver.writer.write
+
+        async def flaky_write(records: list[dict]):
+            if any(record["id"] == failed.id for record in records):
+                raise OSError("disk full")
+            await write(records)
+
+        archiver.writer.write = flaky_write
+        results = await asyncio.gather(archiver.message_created(failed), archiver.message_created(later), return_exceptions=True)
+        checkpoint = archiver.checkpoints.get(thread.id)
+
+        # 다음 스윕이 실패한 메시지부터 다시 읽음
+        archiver.writer.write = write
+        await archiver.sweep(guild)
+        final = archiver.checkpoints.get(thread.id)
+        await archiver.close()
+        return results, swept, checkpoint, final, listener.ids, failed, later
+
+    results, swept, checkpoint, final, ids, failed, later = asyncio.run(scenario())
+    assert isinstance(results[0], OSError) and results[1] is None
+    assert checkpoint == swept
+    assert final == later.id
+    assert ids[-2:] == [failed.id, later.id]
@@ -0,0 +1,66 @@
+from core.autocomplete import AutocompleteIndex, to_choseong, to_jamo
+
+
+def make_index() -> AutocompleteIndex:
+    index = AutocompleteIndex()
+    for key, (name, recency) in enumerate([("지식베이스", 1), ("지식 검색", 2), ("베이스캠프", 3), ("데이터-지식", 4), ("web-api", 5)]):
+        index.add(key, name, recency)
+    return index
+
+
+def test_jamo_and_choseong_keys():
+    assert to_jamo("지식") == "ㅈㅣㅅㅣㄱ"
+    assert to_jamo("ㅘ") == "ㅗㅏ"
+    assert to_choseong("지식 검색") == "ㅈㅅ ㄱㅅ"
+
+
+def test_exact_then_prefix_then_substring():
+    index = make_index()
+
+    assert index.search("지식베이스")[0] == "지식베이스"
+    # 접두사 일치끼리는 최근 활동 순, 그다음 부분 문자열 일치
+    assert index.search("지식") == ["지식 검색", "지식베이스", "데이터-지식"]
+
+
+def test_partial_syllable_matches_prefix():
+    index = make_index()
+
+    # 받침이나 다음 글자의 자음까지만 입력한 상태
+    assert index.search("지시")[:2] == ["지식 검색", "지식베이스"]
+    assert index.search("지식ㅂ")[0] == "지식베이스"
+
+
+def test_choseong_query():
+    index = make_index()
+
+    # 초성 접두사 일치가 초성 부분 일치보다 먼저
+    assert index.search("ㅈㅅ") == ["지식 검색", "지식베이스", "데이터-지식"]
+
+
+def test_typo_falls_back_to_similarity():
+    index = make_index()
+
+    assert index.search("지식배이스") == ["지식베이스"]
+
+
+def test_separators_and_case_are_ignored():
+    index = make_index()
+
+    assert index.search("WEB API") == ["web-api"]
+
+
+def test_empty_query_lists_recent_first_and_touch_reorders():
+    index = make_index()
+    assert index.search("", limit=2) == ["web-api", "데이터-지식"]
+
+    index.touch(0, 10)
+    assert index.search("", limit=2) == ["지식베이스", "web-api"]
+
+
+def test_rename_and_remove_update_index():
+    index = make_index()
+    index.add(0, "지식창고", 1)
+    index.remove(1)
+
+    assert index.search("지식") == ["지식창고", "데이터-지식"]
+    assert len(index) == 4
@@ -0,0 +1,40 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from core.batch import run_batch
+
+
+def test_results_keep_input_order_and_report_partial_failure():
+    async def handler(item: int) -> dict:
+        await asyncio.sleep(0.001 * (5 - item))
+        if item == 2:
+            raise HTTPException(status_code=404, detail="not found")
+        if item == 3:
+            raise ValueError("bad item")
+        return {"status": "success", "item": item}
+
+    result = asyncio.run(run_batch(list(range(5)), handler))
+
+    assert result["status"] == "partial"
+    assert (result["succeeded"], result["failed"]) == (3, 2)
+    assert [entry["index"] for entry in result["results"]] == [0, 1, 2, 3, 4]
+    assert result["results"][2] == {"index": 2, "status": "error", "status_code": 404, "detail": "not found"}
+    assert result["results"][3]["status_code"] == 500
+
+
+def test_concurrency_is_limited():
+    running = peak = 0
+
+    async def handler(item: int) -> dict:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        return {"status": "success"}
+
+    result = asyncio.run(run_batch(list(range(20)), handler, concurrency=3))
+
+    assert result["status"] == "success"
+    assert peak == 3
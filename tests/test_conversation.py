@@ -0,0 +1,105 @@
+from core.conversation import ConversationSessions
+from core.streaming import PLACEHOLDER
+
+BOT_ID = 1
+CHANNEL_ID = 10
+
+
+def entry(message_id: int, content: str, author_id: int = 2, bot: bool = False) -> dict:
+    return {"id": message_id, "author_id": author_id, "bot": bot, "name": f"user{author_id}", "content": content}
+
+
+def payload(session: dict) -> dict:
+    return {"channelId": str(CHANNEL_ID), "session": session}
+
+
+def contents(history: list[dict]) -> list[str]:
+    return [message["content"] for message in history]
+
+
+def test_delta_sends_only_new_messages():
+    conversations = ConversationSessions("delta")
+    entries = [entry(1, "첫 질문"), entry(2, "첫 답변", author_id=BOT_ID)]
+    history, session = conversations.build(CHANNEL_ID, entries, BOT_ID)
+    assert contents(history) == ["첫 질문", "첫 답변"]
+    assert session["reset"] and session["seq"] == 1
+    assert history[1]["role"] == "assistant"
+
+    entries.append(entry(3, "두 번째 질문"))
+    history, next_session = conversations.build(CHANNEL_ID, entries, BOT_ID)
+    assert contents(history) == ["두 번째 질문"]
+    assert next_session["id"] == session["id"] and next_session["seq"] == 2
+    assert not next_session["reset"] and "truncated" not in next_session
+
+
+def test_delta_marks_truncated_window():
+    conversations = ConversationSessions("delta")
+    conversations.build(CHANNEL_ID, [entry(1, "a")], BOT_ID)
+    # 캐시 창(여기서는 2개)보다 많은 메시지가 그 사이에 쌓임
+    history, session = conversations.build(CHANNEL_ID, [entry(5, "e"), entry(6, "f")], BOT_ID)
+
+    assert contents(history) == ["e", "f"]
+    assert session["truncated"]
+
+
+def test_dropped_payload_is_resent():
+    conversations = ConversationSessions("delta")
+    entries = [entry(1, "a")]
+    conversations.build(CHANNEL_ID, entries, BOT_ID)
+    entries.append(entry(2, "b"))
+    _, dropped = conversations.build(CHANNEL_ID, entries, BOT_ID)
+    entries.append(entry(3, "c"))
+    _, delivered = conversations.build(CHANNEL_ID, entries, BOT_ID)
+
+    # 두 번째 페이로드가 4xx로 버려지면 다음 페이로드에 그 메시지부터 다시 실림
+    conversations.dropped(payload(dropped))
+    entries.append(entry(4, "d"))
+    history, session = conversations.build(CHANNEL_ID, entries, BOT_ID)
+    assert contents(history) == ["b", "c", "d"]
+    assert session["id"] == delivered["id"]
+
+
+def test_dropped_reset_payload_starts_new_session():
+    conversations = ConversationSessions("delta")
+    entries = [entry(1, "a")]
+    _, first = conversations.build(CHANNEL_ID, entries, BOT_ID)
+    conversations.dropped(payload(first))
+    entries.append(entry(2, "b"))
+    history, session = conversations.build(CHANNEL_ID, entries, BOT_ID)
+
+    assert contents(history) == ["a", "b"]
+    assert session["reset"] and session["id"] != first["id"]
+
+
+def test_budget_packs_recent_messages_within_chars():
+    conversations = ConversationSessions("budget", budget_chars=30)
+    entries = [
+        entry(1, "오래된 메시지라 예산 밖"),
+        entry(2, "중복"),
+        entry(3, "중복"),
+        entry(4, "다른 봇", author_id=3, bot=True),
+        entry(5, PLACEHOLDER, author_id=BOT_ID, bot=True),
+        entry(6, "최근 질문"),
+    ]
+    history, session = conversations.build(CHANNEL_ID, entries, BOT_ID)
+
+    assert contents(history) == ["중복", "최근 질문"]
+    assert sum(len(message["name"]) + len(message["content"]) for message in history) <= 30
+    assert session["mode"] == "budget" and session["reset"]
+
+
+def test_budget_trims_oversized_trigger_message():
+    conversations = ConversationSessions("budget", budget_chars=20)
+    history, _ = conversations.build(CHANNEL_ID, [entry(1, "x" * 100)], BOT_ID)
+
+    assert history[0]["content"] == "x" * (20 - len("user2"))
+
+
+def test_full_sends_whole_window_every_time():
+    conversations = ConversationSessions("full")
+    entries = [entry(1, "a"), entry(2, "b")]
+    conversations.build(CHANNEL_ID, entries, BOT_ID)
+    history, session = conversations.build(CHANNEL_ID, entries, BOT_ID)
+
+    assert contents(history) == ["a", "b"]
+    assert session["reset"] and session["seq"] == 2
@@ -0,0 +1,49 @@
+from bench.fakes import build_guild
+from core.dashboard import Dashboard
+from core.project_registry import ProjectRegistry
+
+
+def make_dashboard(threads_per_project: int = 3):
+    guild = build_guild(10, threads_per_project=threads_per_project, archived_ratio=0.0)
+    registry = ProjectRegistry()
+    dashboard = Dashboard(registry, lambda guild_id: {})
+    registry.add_listener(dashboard)
+    registry.load_guild(guild)
+    dashboard.load_threads(guild)
+    return guild, registry, dashboard
+
+
+def open_issues(dashboard: Dashboard, guild) -> int:
+    return len(dashboard.guild(guild.id).thread_parent)
+
+
+def test_forum_update_keeps_open_issues():
+    guild, registry, dashboard = make_dashboard()
+    forum = guild.forums[0]
+    assert open_issues(dashboard, guild) == 30
+
+    # 이름 변경과 카테고리 이동 모두 같은 포럼에 대한 CHANNEL_UPDATE
+    forum.name = "renamed"
+    registry.on_channel_update(forum, forum)
+    forum.category_id = guild.categories[1].id
+    registry.on_channel_update(forum, forum)
+
+    assert open_issues(dashboard, guild) == 30
+    assert "**열려있는 이슈**: 30개" in dashboard.render_body(guild.id)
+
+
+def test_category_rename_keeps_open_issues():
+    guild, registry, dashboard = make_dashboard()
+    category = guild.categories[0]
+    category.name = "Renamed Projects"
+    registry.on_channel_update(category, category)
+
+    assert open_issues(dashboard, guild) == 30
+
+
+def test_forum_delete_drops_its_issues():
+    guild, registry, dashboard = make_dashboard()
+    forum = guild.forums[0]
+    registry.on_channel_delete(forum)
+
+    assert open_issues(dashboard, guild) == 27
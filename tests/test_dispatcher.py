@@ -0,0 +1,124 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from aiohttp import web
+
+from core.dispatcher import WebhookDispatcher
+from core.spool import PayloadSpool
+
+
+# n8n 대신 쓰는 로컬 웹훅 서버 (status를 바꿔 장애를 흉내냄)
+class StubWebhook:
+    def __init__(self, status: int = 200):
+        self.status = status
+        self.received: list[dict] = []
+        self.attempts = 0
+        self.url = None
+        self._runner = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.attempts += 1
+        payload = await request.json()
+        if self.status == 200:
+            self.received.append(payload)
+        return web.Response(status=self.status)
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/webhook", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/webhook"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+
+def make_dispatcher(url: str, spool_path: str, reactions: list, on_drop=None) -> WebhookDispatcher:
+    async def react(channel_id: int, message_id: int, emoji: str):
+        reactions.append((message_id, emoji))
+
+    return WebhookDispatcher(url, PayloadSpool(str(spool_path)), react, max_backoff=0.1, compact_interval=1.0, on_drop=on_drop)
+
+
+def message(channel_id: int, message_id: int):
+    return SimpleNamespace(id=message_id, channel=SimpleNamespace(id=channel_id))
+
+
+async def wait_until(condition, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def test_replays_in_order_after_outage(tmp_path):
+    async def scenario():
+        async with StubWebhook(status=503) as n8n:
+            reactions = []
+            dispatcher = make_dispatcher(n8n.url, tmp_path / "spool.sqlite3", reactions)
+            await dispatcher.start()
+            for i in range(30):
+                await dispatcher.submit(message(i % 3, i), {"channelId": str(i % 3), "seq": i})
+            await wait_until(lambda: n8n.attempts >= 6)
+            assert dispatcher.spool.depth == 30
+
+            n8n.status = 200
+            await wait_until(lambda: dispatcher.spool.depth == 0)
+            await dispatcher.close()
+
+        assert len(n8n.received) == 30
+        for channel in ("0", "1", "2"):
+            seqs = [payload["seq"] for payload in n8n.received if payload["channelId"] == channel]
+            assert seqs == sorted(seqs)
+        # 첫 실패는 🔥, 전송이 끝나면 ✅
+        assert {emoji for _, emoji in reactions} == {"🔥", "✅"}
+
+    asyncio.run(scenario())
+
+
+def test_drops_non_retryable_4xx(tmp_path):
+    async def scenario():
+        async with StubWebhook(status=400) as n8n:
+            reactions, dropped = [], []
+            dispatcher = make_dispatcher(n8n.url, tmp_path / "spool.sqlite3", reactions, on_drop=dropped.append)
+            await dispatcher.start()
+            await dispatcher.submit(message(1, 100), {"channelId": "1"})
+            await wait_until(lambda: dispatcher.spool.depth == 0)
+            await wait_until(lambda: reactions)
+            await dispatcher.close()
+
+        assert n8n.attempts == 1
+        assert dispatcher.failed == 1
+        assert reactions == [(100, "❌")]
+        assert dropped == [{"channelId": "1"}]
+
+    asyncio.run(scenario())
+
+
+def test_resends_leftover_rows_after_restart(tmp_path):
+    spool_path = tmp_path / "spool.sqlite3"
+
+    async def scenario():
+        async with StubWebhook(status=503) as down:
+            dispatcher = make_dispatcher(down.url, spool_path, [])
+            await dispatcher.start()
+            for i in range(5):
+                await dispatcher.submit(message(1, i), {"channelId": "1", "seq": i})
+            await wait_until(lambda: down.attempts >= 1)
+            await dispatcher.close()
+
+        async with StubWebhook(status=200) as n8n:
+            dispatcher = make_dispatcher(n8n.url, spool_path, [])
+            await dispatcher.start()
+            await wait_until(lambda: dispatcher.spool.depth == 0)
+            await dispatcher.close()
+
+        assert [payload["seq"] for payload in n8n.received] == [0, 1, 2, 3, 4]
+
+    asyncio.run(scenario())
@@ -0,0 +1,26 @@
+from core.metrics import MetricsRegistry
+
+
+def test_scrape_time_counter_is_exported_as_counter():
+    registry = MetricsRegistry()
+    hits = iter([3, 5])
+    registry.counter("cache_hits_total", "Cache hits.").set_function(lambda: next(hits))
+    registry.gauge("queue_depth", "Queued items.").set_function(lambda: 2)
+
+    first = registry.render().splitlines()
+    assert "# TYPE cache_hits_total counter" in first
+    assert "cache_hits_total 3.0" in first
+    assert "# TYPE queue_depth gauge" in first
+    assert "cache_hits_total 5.0" in registry.render().splitlines()
+
+
+def test_labelled_counter_accumulates():
+    registry = MetricsRegistry()
+    results = registry.counter("webhook_results_total", "Results.", ("outcome",))
+    results.inc(outcome="ok")
+    results.inc(2, outcome="ok")
+    results.inc(outcome="dropped")
+
+    lines = registry.render().splitlines()
+    assert 'webhook_results_total{outcome="ok"} 3.0' in lines
+    assert 'webhook_results_total{outcome="dropped"} 1.0' in lines
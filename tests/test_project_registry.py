@@ -0,0 +1,97 @@
+from bench.fakes import FakeGuild
+from core.autocomplete import AutocompleteService
+from core.project_registry import ACTIVE_CATEGORY, COMPLETED_CATEGORY, ProjectRegistry
+
+
+# 리스너 알림을 순서대로 기록
+class RecordingListener:
+    def __init__(self):
+        self.events: list[tuple] = []
+
+    def guild_loaded(self, guild_id: int):
+        self.events.append(("loaded", guild_id))
+
+    def project_added(self, guild_id: int, channel, status):
+        self.events.append(("added", channel.id, status))
+
+    def project_updated(self, guild_id: int, channel, status):
+        self.events.append(("updated", channel.id, status))
+
+    def project_removed(self, guild_id: int, channel_id: int):
+        self.events.append(("removed", channel_id))
+
+
+def make_registry():
+    guild = FakeGuild(rest_latency=0)
+    active = guild.add_category(ACTIVE_CATEGORY)
+    completed = guild.add_category(COMPLETED_CATEGORY)
+    forum = guild.add_forum("지식베이스", active)
+    registry = ProjectRegistry()
+    listener = RecordingListener()
+    registry.add_listener(listener)
+    registry.load_guild(guild)
+    return guild, registry, listener, forum, active, completed
+
+
+def test_load_and_create_notify_added():
+    guild, registry, listener, forum, active, completed = make_registry()
+    created = guild.add_forum("검색엔진", completed)
+    registry.on_channel_create(created)
+
+    assert listener.events == [("loaded", guild.id), ("added", forum.id, "active"), ("added", created.id, "completed")]
+    assert [channel.id for channel in registry.guild(guild.id).projects("completed")] == [created.id]
+
+
+def test_update_renames_and_moves_without_removal():
+    guild, registry, listener, forum, active, completed = make_registry()
+    projects = registry.guild(guild.id)
+    listener.events.clear()
+
+    forum.name = "지식창고"
+    registry.on_channel_update(forum, forum)
+    forum.category_id = completed.id
+    registry.on_channel_update(forum, forum)
+
+    assert listener.events == [("updated", forum.id, "active"), ("updated", forum.id, "completed")]
+    assert projects.find("지식베이스") == []
+    assert projects.find("지식창고", "completed") == [forum]
+    assert projects.projects("active") == []
+
+
+def test_delete_notifies_removed_once():
+    guild, registry, listener, forum, active, completed = make_registry()
+    listener.events.clear()
+    registry.on_channel_delete(forum)
+    registry.on_channel_delete(forum)
+
+    assert listener.events == [("removed", forum.id)]
+    assert registry.guild(guild.id).get(forum.id) is None
+
+
+def test_category_rename_updates_child_status():
+    guild, registry, listener, forum, active, completed = make_registry()
+    listener.events.clear()
+
+    active.name = "Archived"
+    registry.on_channel_update(active, active)
+    assert listener.events == [("updated", forum.id, None)]
+    assert registry.guild(guild.id).projects("active") == []
+
+    active.name = ACTIVE_CATEGORY
+    registry.on_channel_update(active, active)
+    assert listener.events[-1] == ("updated", forum.id, "active")
+    assert registry.guild(guild.id).category_for("active") is active
+
+
+def test_update_moves_autocomplete_entry():
+    guild, registry, listener, forum, active, completed = make_registry()
+    autocomplete = AutocompleteService()
+    registry.add_listener(autocomplete)
+    registry.load_guild(guild)
+
+    forum.name = "지식창고"
+    forum.category_id = completed.id
+    registry.on_channel_update(forum, forum)
+
+    assert autocomplete.projects(guild.id, "active", "") == []
+    assert autocomplete.projects(guild.id, "completed", "지식") == ["지식창고"]
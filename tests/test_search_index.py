@@ -0,0 +1,91 @@
+import asyncio
+import sqlite3
+
+from core.search_index import SearchIndex
+
+
+def record(message_id: int, content: str, thread: str = "이슈", created_at: str = "2026-01-01T00:00:00+00:00") -> dict:
+    return {
+        "event": "message",
+        "id": message_id,
+        "guild_id": 1,
+        "project_id": 10,
+        "project": "knowledge",
+        "thread_id": 100,
+        "thread": thread,
+        "tags": [],
+        "author": "tester",
+        "bot": False,
+        "content": content,
+        "created_at": created_at,
+    }
+
+
+def search(path, records: list[dict], query: str, **kwargs) -> list[dict]:
+    async def scenario():
+        index = SearchIndex(str(path))
+        await index.open()
+        await index.archived(records)
+        results = await index.search(query, **kwargs)
+        await index.close()
+        return results
+
+    return asyncio.run(scenario())
+
+
+def test_two_char_korean_terms_are_ranked(tmp_path):
+    records = [
+        record(1, "배포 끝났습니다", created_at="2026-01-03T00:00:00+00:00"),
+        record(2, "서버 오류가 났어요. 서버 로그에 오류가 계속 찍힙니다", created_at="2026-01-01T00:00:00+00:00"),
+        record(3, "서버가 느려요", created_at="2026-01-02T00:00:00+00:00"),
+    ]
+    results = search(tmp_path / "search.sqlite3", records, "서버")
+
+    # 최신순이 아니라 관련도순 (서버가 두 번 나온 메시지가 먼저)
+    assert [result["id"] for result in results] == [2, 3]
+    assert all(result["score"] is not None for result in results)
+    assert "**서버**" in results[0]["snippet"]
+
+
+def test_two_char_terms_combine_with_long_terms(tmp_path):
+    records = [
+        record(1, "배포 중에 서버가 멈췄습니다"),
+        record(2, "배포 스크립트를 고쳤습니다"),
+        record(3, "서버가 멈췄다가 돌아왔습니다"),
+    ]
+    results = search(tmp_path / "search.sqlite3", records, "배포 멈췄습")
+
+    assert [result["id"] for result in results] == [1]
+    assert "**멈췄습**" in results[0]["snippet"]
+
+
+def test_edit_and_delete_update_bigram_index(tmp_path):
+    async def scenario():
+        index = SearchIndex(str(tmp_path / "search.sqlite3"))
+        await index.open()
+        await index.archived([record(1, "서버 오류"), record(2, "오류 없음")])
+        await index.archived([{"event": "edit", "id": 1, "content": "배포 완료"}, {"event": "delete", "id": 2}])
+        results = {query: [result["id"] for result in await index.search(query)] for query in ("오류", "배포")}
+        await index.close()
+        return results
+
+    assert asyncio.run(scenario()) == {"오류": [], "배포": [1]}
+
+
+def test_existing_index_is_backfilled(tmp_path):
+    path = tmp_path / "search.sqlite3"
+    search(path, [record(1, "서버 오류")], "서버")
+    # bigram 색인이 생기기 전의 색인 파일처럼 만듦
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE messages_bigram")
+    conn.commit()
+    conn.close()
+
+    assert [result["id"] for result in search(path, [], "오류")] == [1]
+
+
+def test_single_char_terms_fall_back_to_like(tmp_path):
+    results = search(tmp_path / "search.sqlite3", [record(1, "a b c"), record(2, "d e f")], "b")
+
+    assert [result["id"] for result in results] == [1]
+    assert results[0]["score"] is None
@@ -0,0 +1,108 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from core.streaming import PLACEHOLDER, ReplyStreamManager
+from core.text import MESSAGE_LIMIT
+
+
+class FakeMessage:
+    def __init__(self, writes: "FakeWrites", content: str):
+        self.id = len(writes.sent)
+        self.writes = writes
+        self.content = content
+        self.deleted = False
+
+    async def edit(self, content: str):
+        if self.deleted:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+        self.content = content
+
+
+# WriteScheduler 대역 (보낸 메시지를 기록하고 바로 실행)
+class FakeWrites:
+    def __init__(self):
+        self.sent: list[FakeMessage] = []
+
+    async def send_message(self, channel, priority=None, **kwargs) -> FakeMessage:
+        message = FakeMessage(self, kwargs["content"])
+        self.sent.append(message)
+        return message
+
+    async def submit(self, bucket, func, priority=None):
+        return await func()
+
+    def stats(self) -> dict:
+        return {"rate_limited": 0}
+
+
+def make_manager(**kwargs) -> tuple[ReplyStreamManager, FakeWrites]:
+    writes = FakeWrites()
+    return ReplyStreamManager(writes, min_interval=0.01, max_interval=0.05, **kwargs), writes
+
+
+CHANNEL = SimpleNamespace(id=1)
+
+
+def test_rollover_splits_at_newlines():
+    async def scenario():
+        manager, writes = make_manager()
+        reply_id = await manager.start(CHANNEL)
+        stream = manager.get(reply_id)
+        lines = [f"line {i:04d} " + "x" * 40 for i in range(120)]
+        for line in lines:
+            stream.append(line + "\n")
+        await manager.finish(reply_id)
+        return writes
+
+    writes = asyncio.run(scenario())
+    contents = [message.content for message in writes.sent]
+    assert len(contents) > 1
+    assert all(0 < len(content) <= MESSAGE_LIMIT for content in contents)
+    assert PLACEHOLDER not in contents
+    # 줄 단위로 나뉘어 원래 텍스트가 그대로 이어짐
+    assert "\n".join(contents).split("\n") == [f"line {i:04d} " + "x" * 40 for i in range(120)]
+
+
+def test_rollover_on_trailing_newline_leaves_no_placeholder():
+    async def scenario():
+        manager, writes = make_manager()
+        reply_id = await manager.start(CHANNEL)
+        manager.get(reply_id).append("a" * MESSAGE_LIMIT + "\n")
+        await manager.finish(reply_id)
+        return writes
+
+    writes = asyncio.run(scenario())
+    assert [message.content for message in writes.sent] == ["a" * MESSAGE_LIMIT]
+
+
+def test_failed_edit_is_reported():
+    async def scenario():
+        manager, writes = make_manager()
+        reply_id = await manager.start(CHANNEL)
+        stream = manager.get(reply_id)
+        writes.sent[0].deleted = True
+        stream.append("hello")
+        await manager.finish(reply_id)
+        return stream
+
+    stream = asyncio.run(scenario())
+    assert isinstance(stream.error, discord.NotFound)
+
+
+def test_idle_streams_are_finished():
+    async def scenario():
+        manager, writes = make_manager(idle_timeout=0.05)
+        reply_id = await manager.start(CHANNEL)
+        manager.get(reply_id).append("partial answer")
+        for _ in range(100):
+            if manager.get(reply_id) is None and not manager._finishing:
+                break
+            await asyncio.sleep(0.02)
+        await manager.close()
+        return manager, reply_id, writes
+
+    manager, reply_id, writes = asyncio.run(scenario())
+    assert manager.get(reply_id) is None
+    assert writes.sent[0].content == "partial answer"
@@ -0,0 +1,129 @@
+import asyncio
+from types import SimpleNamespace
+
+from core.write_scheduler import BACKGROUND, INTERACTIVE, WriteScheduler
+
+
+async def settle():
+    # 버킷 워커들이 슬롯 대기열에 들어갈 때까지 이벤트 루프를 돌림
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def recorder(order: list, name, running: set | None = None, overlaps: list | None = None):
+    async def job():
+        if running is not None:
+            if running:
+                overlaps.append(name)
+            running.add(name)
+        order.append(name)
+        await asyncio.sleep(0.001)
+        if running is not None:
+            running.discard(name)
+        return name
+
+    return job
+
+
+def test_same_bucket_runs_in_submit_order_one_at_a_time():
+    async def scenario():
+        writes = WriteScheduler(max_concurrency=8)
+        order, running, overlaps = [], set(), []
+        results = await asyncio.gather(*(writes.submit("bucket", recorder(order, i, running, overlaps)) for i in range(10)))
+        return order, overlaps, results, writes.stats()
+
+    order, overlaps, results, stats = asyncio.run(scenario())
+    assert order == list(range(10)) and results == list(range(10))
+    assert overlaps == []
+    assert stats["completed"] == 10 and stats["queued"] == 0
+
+
+def test_interactive_jumps_background_queue():
+    async def scenario():
+        writes = WriteScheduler(max_concurrency=1)
+        order = []
+        gate = asyncio.Event()
+        blocker = asyncio.ensure_future(writes.submit("blocker", gate.wait))
+        await settle()
+        # 다른 버킷의 백그라운드 작업들이 슬롯을 기다리는 중에 명령어 응답이 들어옴
+        tasks = [asyncio.ensure_future(writes.submit(("reaction", i), recorder(order, f"bg{i}"))) for i in range(3)]
+        await settle()
+        tasks.append(asyncio.ensure_future(writes.submit(("message", 1), recorder(order, "reply"), INTERACTIVE)))
+        await settle()
+        gate.set()
+        await asyncio.gather(blocker, *tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["reply", "bg0", "bg1", "bg2"]
+
+
+def test_priority_within_bucket():
+    async def scenario():
+        writes = WriteScheduler(max_concurrency=1)
+        order = []
+        gate = asyncio.Event()
+
+        async def first():
+            order.append("first")
+            await gate.wait()
+
+        tasks = [asyncio.ensure_future(writes.submit("bucket", first))]
+        await settle()
+        tasks.append(asyncio.ensure_future(writes.submit("bucket", recorder(order, "bg"), BACKGROUND)))
+        tasks.append(asyncio.ensure_future(writes.submit("bucket", recorder(order, "reply"), INTERACTIVE)))
+        await settle()
+        gate.set()
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["first", "reply", "bg"]
+
+
+def test_pending_channel_edits_are_coalesced():
+    class Channel:
+        id = 1
+        available_tags = [SimpleNamespace(name="bug")]
+
+        def __init__(self):
+            self.edits: list[dict] = []
+
+        async def edit(self, **fields):
+            self.edits.append(fields)
+
+    async def scenario():
+        writes = WriteScheduler(max_concurrency=1)
+        channel = Channel()
+        gate = asyncio.Event()
+        blocker = asyncio.ensure_future(writes.submit("blocker", gate.wait))
+        await settle()
+        edits = [
+            asyncio.ensure_future(writes.edit_channel(channel, name="renamed")),
+            asyncio.ensure_future(writes.edit_channel(channel, topic="topic")),
+            asyncio.ensure_future(writes.update_tags(channel, add=[SimpleNamespace(name="question")], remove=["bug"])),
+        ]
+        await settle()
+        gate.set()
+        await asyncio.gather(blocker, *edits)
+        return channel, writes.stats()
+
+    channel, stats = asyncio.run(scenario())
+    assert len(channel.edits) == 1
+    edit = channel.edits[0]
+    assert edit["name"] == "renamed" and edit["topic"] == "topic"
+    assert [tag.name for tag in edit["available_tags"]] == ["question"]
+    assert stats["coalesced"] == 2
+
+
+def test_failure_is_returned_to_caller_only():
+    async def scenario():
+        writes = WriteScheduler()
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(writes.submit("bucket", fail), writes.submit("bucket", recorder([], "ok")), return_exceptions=True)
+        return results, writes.stats()
+
+    results, stats = asyncio.run(scenario())
+    assert isinstance(results[0], RuntimeError) and results[1] == "ok"
+    assert stats["failed"] == 1 and stats["completed"] == 1